@@ -0,0 +1,79 @@
+# "Did you mean" benchmark: time to build the segment index and per-query
+# cost of FuzzyIndex.search() against a linear edit distance scan, at several
+# dictionary sizes. Typo queries are dictionary words with one or two letters
+# replaced; miss queries are random strings, most with no close match.
+#
+# Run from the repository root:
+#   python benchmarks/corrections.py [sizes...]
+
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine import generate_words  # noqa: E402
+from fuzzy_index import FuzzyIndex, edit_distance  # noqa: E402
+
+DEFAULT_SIZES = (10000, 100000, 300000)
+QUERIES = 200
+SCANNED_QUERIES = 20  # The linear scan is slow; time it on a subset
+
+
+def typo_queries(words, rng):
+    """Dictionary words with one or two letters replaced"""
+    queries = []
+    for _ in range(QUERIES):
+        letters = list(rng.choice(words))
+        for _ in range(rng.randint(1, 2)):
+            letters[rng.randrange(len(letters))] = rng.choice(string.ascii_lowercase)
+        queries.append("".join(letters))
+    return queries
+
+
+def miss_queries(rng):
+    """Random strings of dictionary-like lengths"""
+    return ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 12)))
+            for _ in range(QUERIES)]
+
+
+def scan(words, word, max_distance=2, limit=5):
+    """The linear scan the index replaces"""
+    matches = []
+    for candidate in words:
+        distance = edit_distance(word, candidate, max_distance)
+        if distance <= max_distance:
+            matches.append((distance, candidate))
+    matches.sort()
+    return matches[:limit]
+
+
+def per_query(search, queries):
+    """Mean milliseconds per query"""
+    started = time.perf_counter()
+    for query in queries:
+        search(query)
+    return (time.perf_counter() - started) / len(queries) * 1000
+
+
+def main():
+    sizes = [int(size) for size in sys.argv[1:]] or DEFAULT_SIZES
+    print(f"{'words':>8} {'build s':>8} {'typo ms':>8} {'miss ms':>8} {'scan ms':>8}")
+    for size in sizes:
+        words = generate_words(size, 1234)
+        rng = random.Random(7)
+        typos, misses = typo_queries(words, rng), miss_queries(rng)
+        started = time.perf_counter()
+        index = FuzzyIndex(words)
+        build = time.perf_counter() - started
+        sample = typos[:SCANNED_QUERIES // 2] + misses[:SCANNED_QUERIES // 2]
+        assert all(index.search(query) == scan(words, query) for query in sample)
+        print(f"{size:>8} {build:>8.2f} {per_query(index.search, typos):>8.2f} "
+              f"{per_query(index.search, misses):>8.2f} "
+              f"{per_query(lambda query: scan(words, query), sample):>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
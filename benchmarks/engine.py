@@ -0,0 +1,232 @@
+# Reproducible benchmark suite for the dictionary engine.
+#
+# Generates synthetic dictionaries (seeded, so every run uses the same words)
+# at each size, builds them with insert() in sorted and in random order, and
+# times load_from_file, search (hit and miss), prefix suggestions, insert,
+# delete, save_to_file and get_word_of_the_day. Each (size, order) case runs
+# in a fresh interpreter so its peak memory is measured in isolation.
+#
+# Results are JSON; pass an earlier run with --compare to flag regressions.
+#
+# Run from the repository root:
+#   python benchmarks/engine.py --output results.json
+#   python benchmarks/engine.py --sizes 10000 100000 --compare results.json
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import string
+import subprocess
+import sys
+import tempfile
+import time
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bst_dictionary import BSTDictionary  # noqa: E402
+from storage import StorageBackend  # noqa: E402
+
+DEFAULT_SIZES = (10000, 100000, 1000000)
+ORDERS = ("sorted", "random")
+# Higher is better for ops_per_sec; everything else in a result is informational
+COMPARED_METRIC = "ops_per_sec"
+
+
+class NullBackend(StorageBackend):
+    """Discards journal writes so insert/delete timings measure the engine, not the disk"""
+    def load(self, dictionary):
+        pass
+
+    def write(self, dictionary, records):
+        pass
+
+    def save(self, words):
+        pass
+
+
+def generate_words(count, seed):
+    """Return count distinct pseudo-random lowercase words (3-12 letters)"""
+    rng = random.Random(seed)
+    words = set()
+    while len(words) < count:
+        words.add("".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 12))))
+    return sorted(words)
+
+
+def measure(operation, arguments):
+    """Call operation once per argument; return ops/sec and p50/p99 latency"""
+    latencies = []
+    clock = time.perf_counter_ns
+    started = clock()
+    for argument in arguments:
+        before = clock()
+        operation(argument)
+        latencies.append(clock() - before)
+    elapsed = (clock() - started) / 1e9
+    latencies.sort()
+    return {
+        "ops": len(latencies),
+        "seconds": round(elapsed, 6),
+        "ops_per_sec": round(len(latencies) / elapsed, 1) if elapsed else None,
+        "p50_us": round(latencies[len(latencies) // 2] / 1e3, 3),
+        "p99_us": round(latencies[min(len(latencies) - 1, len(latencies) * 99 // 100)] / 1e3, 3),
+    }
+
+
+def best_of(repeat, operation, arguments):
+    """Repeat a read-only benchmark and keep the fastest run, to damp scheduler noise"""
+    return max((measure(operation, arguments) for _ in range(repeat)),
+               key=lambda result: result["ops_per_sec"] or 0)
+
+
+def run_case(size, order, queries, seed, snapshot_format, repeat):
+    """Benchmark one dictionary size and insertion order in this process"""
+    rng = random.Random(seed)
+    words = generate_words(size, seed)
+    entries = [(word, f"Meaning of {word}.", f"An example using {word}.") for word in words]
+    if order == "random":
+        rng.shuffle(entries)
+    hits = [rng.choice(words) for _ in range(queries)]
+    misses = [word + "1" for word in hits]  # Generated words are letters only
+    prefixes = [word[:2] for word in hits]
+    doomed = rng.sample(words, min(queries, size))
+    results = {}
+
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "dictionary" + snapshot_format)
+        built = BSTDictionary(filename, autoload=False, backend=NullBackend())
+        results["insert"] = measure(lambda entry: built.insert(*entry), entries)
+        results["save_to_file"] = measure(built.save_to_file, [filename])
+        results["save_to_file"]["bytes"] = os.path.getsize(filename)
+        built.close()
+        del built, entries  # Peak memory then reflects one tree, not two
+
+        # The remaining operations run against the tree loaded from the snapshot
+        dictionary = BSTDictionary(filename, autoload=False, backend=NullBackend())
+        results["load_from_file"] = measure(dictionary.load_from_file, [filename])
+
+        lookup = lambda word: dictionary.search(word, record=False)  # noqa: E731
+        results["search_hit"] = best_of(repeat, lookup, hits)
+        results["search_miss"] = best_of(repeat, lookup, misses)
+        results["get_suggestions"] = best_of(
+            repeat, lambda prefix: dictionary.get_suggestions(prefix, 10), prefixes)
+        results["get_word_of_the_day"] = best_of(
+            repeat, lambda _: dictionary.get_word_of_the_day(), range(queries))
+        results["delete"] = measure(dictionary.delete, doomed)
+        height = dictionary.get_height()
+        dictionary.close()
+
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    peak = None
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        peak *= 1 if sys.platform == "darwin" else 1024
+    return {"size": size, "order": order, "tree_height": height, "peak_rss_bytes": peak,
+            "operations": results}
+
+
+def run_suite(args):
+    """Run every case in a child interpreter and collect the results"""
+    cases = []
+    for size in args.sizes:
+        for order in args.orders:
+            print(f"benchmarking {size} words, {order} order...", file=sys.stderr)
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--case", str(size), order,
+                 "--queries", str(args.queries), "--seed", str(args.seed),
+                 "--repeat", str(args.repeat),
+                 "--snapshot-format", args.snapshot_format],
+                check=True, stdout=subprocess.PIPE, text=True).stdout
+            cases.append(json.loads(output))
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "queries": args.queries,
+            "repeat": args.repeat,
+            "snapshot_format": args.snapshot_format,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "cases": cases,
+    }
+
+
+def compare(baseline, current, threshold):
+    """Print ops/sec changes against a baseline run; return the number of regressions"""
+    previous = {(case["size"], case["order"]): case for case in baseline["cases"]}
+    regressions = 0
+    for case in current["cases"]:
+        old_case = previous.get((case["size"], case["order"]))
+        if old_case is None:
+            continue
+        for name, result in case["operations"].items():
+            old = old_case["operations"].get(name)
+            if not isinstance(result, dict) or not isinstance(old, dict) or \
+                    not old.get(COMPARED_METRIC) or not result.get(COMPARED_METRIC):
+                continue
+            change = result[COMPARED_METRIC] / old[COMPARED_METRIC] - 1
+            flag = ""
+            if change < -threshold:
+                flag = "  REGRESSION"
+                regressions += 1
+            print(f"{case['size']:>8} {case['order']:<7} {name:<20} "
+                  f"{old[COMPARED_METRIC]:>14,.1f} -> {result[COMPARED_METRIC]:>14,.1f} "
+                  f"({change:+.1%}){flag}", file=sys.stderr)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the dictionary engine.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="dictionary sizes to generate (default: 10000 100000 1000000)")
+    parser.add_argument("--orders", nargs="+", choices=ORDERS, default=list(ORDERS),
+                        help="insertion orders to build the tree in")
+    parser.add_argument("--queries", type=int, default=20000,
+                        help="operations timed per lookup/delete benchmark")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="runs of each read-only benchmark; the fastest is reported")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--snapshot-format", choices=(".json", ".bin"), default=".json",
+                        help="file format timed by save_to_file/load_from_file")
+    parser.add_argument("--output", help="write the JSON results here instead of stdout")
+    parser.add_argument("--compare", help="earlier results file to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="ops/sec drop reported as a regression (default: 0.10)")
+    parser.add_argument("--case", nargs=2, metavar=("SIZE", "ORDER"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        # Child process: the dictionary's print() status messages go to stderr
+        with contextlib.redirect_stdout(sys.stderr):
+            result = run_case(int(args.case[0]), args.case[1], args.queries, args.seed,
+                              args.snapshot_format, args.repeat)
+        print(json.dumps(result))
+        return 0
+
+    results = run_suite(args)
+    text = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+    if args.compare:
+        with open(args.compare, "r") as file:
+            regressions = compare(json.load(file), results, args.threshold)
+        print(f"{regressions} regression(s) beyond {args.threshold:.0%}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+# Memory benchmark: bytes per dictionary entry for the __slots__ Node
+# compared with a __dict__-based node holding exactly the same fields.
+#
+# Run from the repository root:
+#   python benchmarks/node_memory.py [entries]
+
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bst_dictionary import Node  # noqa: E402
+
+
+class DictNode:
+    """Node's current fields in a per-instance __dict__, as before __slots__"""
+    def __init__(self, word, meaning, example_sentence=""):
+        self.word = word.lower()
+        self.meaning = meaning
+        self.example_sentence = example_sentence
+        self.left = None
+        self.right = None
+        self.height = 1
+        self.size = 1
+
+
+def bytes_per_entry(node_class, entries):
+    """Measure memory allocated while building one node per entry"""
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    nodes = [node_class(word, meaning, example) for word, meaning, example in entries]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (after - before) / len(nodes)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    # Payload strings are shared so the numbers isolate per-node overhead
+    meaning = "A synthetic meaning used for the memory benchmark."
+    example = "A synthetic example sentence."
+    # Words are generated upper-case so lower() builds a fresh string per node, as on load
+    entries = [(f"WORD{i:07d}", meaning, example) for i in range(count)]
+    old = bytes_per_entry(DictNode, entries)
+    new = bytes_per_entry(Node, entries)
+    print(f"entries:            {count}")
+    print(f"__dict__ Node:      {old:.1f} bytes/entry")
+    print(f"__slots__ Node:     {new:.1f} bytes/entry")
+    print(f"saving:             {old - new:.1f} bytes/entry ({(old - new) / old:.0%})")
+
+
+if __name__ == "__main__":
+    main()
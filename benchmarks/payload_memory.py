@@ -0,0 +1,107 @@
+# Memory benchmark: bytes per dictionary entry with meanings and examples
+# held as plain strings compared with compress_payloads=True, plus the cost
+# of reading a payload back with and without the decompressed-entry cache.
+#
+# Definitions are generated from a Zipf-distributed vocabulary so common
+# words and phrases repeat the way they do in real dictionaries.
+#
+# Run from the repository root:
+#   python benchmarks/payload_memory.py [entries]
+
+import gc
+import itertools
+import os
+import random
+import string
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bst_dictionary import BSTDictionary  # noqa: E402
+from storage import StorageBackend  # noqa: E402
+
+VOCABULARY = 5000
+
+
+class NullBackend(StorageBackend):
+    """Keeps the benchmark off the disk"""
+    def load(self, dictionary):
+        pass
+
+    def write(self, dictionary, records):
+        pass
+
+    def save(self, words):
+        pass
+
+
+def generate_entries(count, seed=1234):
+    """Return count sorted (word, meaning, example) entries with natural-looking repetition"""
+    rng = random.Random(seed)
+    vocabulary = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 9)))
+                  for _ in range(VOCABULARY)]
+    weights = list(itertools.accumulate(1 / rank for rank in range(1, VOCABULARY + 1)))
+
+    def sentence(low, high):
+        words = rng.choices(vocabulary, cum_weights=weights, k=rng.randint(low, high))
+        return " ".join(words).capitalize() + "."
+
+    return [(f"word{i:07d}", sentence(6, 18), sentence(5, 12)) for i in range(count)]
+
+
+def build(entries, compress):
+    """Build a dictionary and measure the bytes per entry it keeps alive"""
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    # Fresh copies of the text so the tree owns its strings, as it does after loading a file
+    copies = [(word, meaning.encode().decode(), example.encode().decode())
+              for word, meaning, example in entries]
+    dictionary = BSTDictionary.from_sorted_entries(
+        copies, backend=NullBackend(), compress_payloads=compress)
+    del copies
+    gc.collect()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return dictionary, (after - before) / len(entries)
+
+
+def read_time(dictionary, words):
+    """Mean microseconds to look a word up and read its meaning and example"""
+    started = time.perf_counter()
+    for word in words:
+        node = dictionary.search(word, record=False)
+        node.meaning, node.example_sentence
+    return (time.perf_counter() - started) / len(words) * 1e6
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    entries = generate_entries(count)
+    rng = random.Random(1)
+    spread = [rng.choice(entries)[0] for _ in range(20000)]  # Mostly cache misses
+    repeated = [rng.choice(spread[:100]) for _ in range(20000)]  # Fits in the cache
+
+    plain, plain_bytes = build(entries, False)
+    plain_spread = read_time(plain, spread)
+    del plain
+    compressed, compressed_bytes = build(entries, True)
+    stats = compressed.compression_stats()
+
+    print(f"entries:                 {count}")
+    print(f"plain strings:           {plain_bytes:.1f} bytes/entry")
+    print(f"compressed payloads:     {compressed_bytes:.1f} bytes/entry")
+    print(f"saving:                  {plain_bytes - compressed_bytes:.1f} bytes/entry "
+          f"({(plain_bytes - compressed_bytes) / plain_bytes:.0%})")
+    print(f"payload only:            {stats['plain_bytes_per_entry']:.1f} -> "
+          f"{stats['compressed_bytes_per_entry']:.1f} bytes/entry "
+          f"(preset dictionary {stats['dictionary_bytes']} bytes)")
+    print(f"read, plain:             {plain_spread:.2f} us")
+    print(f"read, compressed:        {read_time(compressed, spread):.2f} us")
+    print(f"read, compressed+cached: {read_time(compressed, repeated):.2f} us")
+
+
+if __name__ == "__main__":
+    main()
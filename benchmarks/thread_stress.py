@@ -0,0 +1,125 @@
+# Stress test for BSTDictionary(thread_safe=True): reader threads hammer
+# lookups, prefix/range scans and order statistics while writer threads
+# insert and delete, then the tree invariants, the final contents and the
+# persisted journal are checked.
+#
+# Run from the repository root:
+#   python benchmarks/thread_stress.py [readers] [writers] [seconds]
+
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bst_dictionary import BSTDictionary  # noqa: E402
+
+BASE_WORDS = 20000  # Words no writer touches; readers must always find them
+
+
+def reader(dictionary, stop, errors, counts, seed):
+    """Run random read operations and check each result is internally consistent"""
+    rng = random.Random(seed)
+    operations = 0
+    while not stop.is_set():
+        index = rng.randrange(BASE_WORDS)
+        word = f"base{index:06d}"
+        choice = rng.random()
+        if choice < 0.5:
+            node = dictionary.search(word, record=False)
+            if node is None or node.meaning != f"meaning {index}":
+                errors.append(f"lookup of {word} returned {node and node.meaning!r}")
+        elif choice < 0.7:
+            suggestions = dictionary.get_suggestions(word[:-2], 10)
+            if suggestions != sorted(suggestions) or not suggestions[0].startswith(word[:-2]):
+                errors.append(f"bad suggestions for {word[:-2]}: {suggestions}")
+        elif choice < 0.85:
+            words = [node.word for node in dictionary.iter_range(word, word[:-1] + "9")]
+            if words != sorted(words) or word not in words:
+                errors.append(f"bad range starting at {word}")
+        elif choice < 0.95:
+            # Writers' words sort after every base word, so base ranks never move
+            if dictionary.rank(word) != index or dictionary.select(index).word != word:
+                errors.append(f"rank/select of {word} is wrong")
+        else:
+            if word not in dictionary.match_pattern(word[:-1] + "?"):
+                errors.append(f"no wildcard match for {word}")
+        operations += 1
+    counts.append(operations)
+
+
+def writer(dictionary, stop, model, counts, writer_id, seed):
+    """Insert and delete words owned by this writer, mirroring them in model"""
+    rng = random.Random(seed)
+    operations = 0
+    while not stop.is_set():
+        word = f"w{writer_id}-{rng.randrange(2000):04d}"
+        if word in model and rng.random() < 0.4:
+            dictionary.delete(word)
+            del model[word]
+        else:
+            meaning = f"meaning {rng.random()}"
+            dictionary.insert(word, meaning)
+            model[word] = meaning
+        operations += 1
+    counts.append(operations)
+
+
+def main():
+    readers = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    writers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    seconds = float(sys.argv[3]) if len(sys.argv) > 3 else 5.0
+
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "dictionary.json")
+        entries = [(f"base{i:06d}", f"meaning {i}", "") for i in range(BASE_WORDS)]
+        dictionary = BSTDictionary.from_sorted_entries(
+            entries, filename, thread_safe=True, write_behind=True, cache_size=1024)
+        dictionary.save_to_file()
+
+        stop = threading.Event()
+        errors, read_counts, write_counts = [], [], []
+        models = [{} for _ in range(writers)]
+        threads = [threading.Thread(target=reader, args=(dictionary, stop, errors, read_counts, i))
+                   for i in range(readers)]
+        threads += [threading.Thread(target=writer,
+                                     args=(dictionary, stop, models[i], write_counts, i, 1000 + i))
+                    for i in range(writers)]
+        for thread in threads:
+            thread.start()
+        time.sleep(seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+        # Every owned word must match its writer's model and nothing else may survive
+        expected = {f"base{i:06d}": f"meaning {i}" for i in range(BASE_WORDS)}
+        for model in models:
+            expected.update(model)
+        actual = {word: data["meaning"] for word, data in dictionary.snapshot_words().items()}
+        if actual != expected:
+            errors.append(f"final contents differ from the writers' models "
+                          f"({len(actual)} words, expected {len(expected)})")
+        errors.extend(dictionary.check_invariants())
+        dictionary.close()
+
+        # The journal must replay to the same contents
+        reloaded = BSTDictionary(filename)
+        if {word: data["meaning"] for word, data in reloaded.snapshot_words().items()} != expected:
+            errors.append("reloaded dictionary differs from the in-memory one")
+        reloaded.close()
+
+    print(f"readers:            {readers} ({sum(read_counts) / seconds:,.0f} ops/s)")
+    print(f"writers:            {writers} ({sum(write_counts) / seconds:,.0f} ops/s)")
+    print(f"final words:        {len(expected)}")
+    for error in errors[:20]:
+        print(f"ERROR: {error}")
+    print("FAILED" if errors else "OK")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
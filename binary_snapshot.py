@@ -0,0 +1,159 @@
+# Compact binary snapshot format for the dictionary, read through mmap.
+#
+# Layout (all integers little-endian):
+#   header          magic "BSTD", version, flags, entry count,
+#                   key block offset, payload region offset
+#   key offsets     (count + 1) uint32 offsets into the key block
+#   payload offsets (count + 1) uint64 offsets into the payload region
+#   key block       UTF-8 words, sorted, concatenated
+#   preset dict     (version 2 only) zlib dictionary shared by every payload
+#   payload region  per entry: uint32 meaning length, meaning, example (UTF-8),
+#                   raw-deflated against the preset dictionary in version 2
+#
+# Words are stored sorted, so a lookup is a binary search over the key block
+# that never touches the payload region; a meaning/example is only decoded
+# when it is asked for.
+
+import json
+import mmap
+import struct
+
+from payload_codec import MEANING_LENGTH, PayloadCodec, pack_payload
+
+MAGIC = b"BSTD"
+VERSION = 1
+COMPRESSED_VERSION = 2  # Written only with compress=True, so plain files stay readable by version 1
+FLAG_COMPRESSED = 1
+HEADER = struct.Struct("<4sHHIQQ")
+KEY_OFFSET = struct.Struct("<I")
+PAYLOAD_OFFSET = struct.Struct("<Q")
+BINARY_EXTENSION = ".bin"  # Snapshot filenames with this suffix use the binary format
+
+
+def write_binary(file, entries, compress=False):
+    """Write (word, meaning, example) entries, sorted by word, to a binary file object"""
+    entries = list(entries)
+    keys = [word.encode("utf-8") for word, _, _ in entries]
+    if compress:
+        codec = PayloadCodec.trained((meaning, example) for _, meaning, example in entries)
+        payloads = [codec.compress(meaning, example) for _, meaning, example in entries]
+        zdict = codec.zdict
+        version, flags = COMPRESSED_VERSION, FLAG_COMPRESSED
+    else:
+        payloads = [pack_payload(meaning, example) for _, meaning, example in entries]
+        zdict = b""
+        version, flags = VERSION, 0
+    count = len(keys)
+    key_block_start = HEADER.size + (count + 1) * (KEY_OFFSET.size + PAYLOAD_OFFSET.size)
+    key_block_size = sum(len(key) for key in keys)
+    file.write(HEADER.pack(MAGIC, version, flags, count, key_block_start,
+                           key_block_start + key_block_size + len(zdict)))
+    # Offset tables; the extra final entry marks the end of the last item
+    offset = 0
+    for key in keys + [b""]:
+        file.write(KEY_OFFSET.pack(offset))
+        offset += len(key)
+    offset = 0
+    for payload in payloads + [b""]:
+        file.write(PAYLOAD_OFFSET.pack(offset))
+        offset += len(payload)
+    file.write(b"".join(keys))
+    file.write(zdict)
+    file.write(b"".join(payloads))
+
+
+class BinarySnapshot:
+    """Read-only, memory-mapped view of a binary snapshot file"""
+    def __init__(self, filename):
+        with open(filename, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, flags, self.count, self._key_block, self._payloads = \
+            HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version not in (VERSION, COMPRESSED_VERSION):
+            self._map.close()
+            raise ValueError(f"{filename} is not a version {VERSION} or {COMPRESSED_VERSION} "
+                             f"dictionary snapshot")
+        self._key_offsets = HEADER.size
+        self._payload_offsets = HEADER.size + (self.count + 1) * KEY_OFFSET.size
+        self.codec = None  # Decompresses payloads of a compressed snapshot
+        if flags & FLAG_COMPRESSED:
+            # The preset dictionary sits between the end of the key block and the payloads
+            (key_block_size,) = KEY_OFFSET.unpack_from(
+                self._map, self._key_offsets + self.count * KEY_OFFSET.size)
+            self.codec = PayloadCodec(self._map[self._key_block + key_block_size:self._payloads])
+
+    def __len__(self):
+        return self.count
+
+    def _key_bytes(self, index):
+        """Raw UTF-8 bytes of the index-th word"""
+        start, end = struct.unpack_from("<II", self._map, self._key_offsets + index * KEY_OFFSET.size)
+        return self._map[self._key_block + start:self._key_block + end]
+
+    def key(self, index):
+        """Decode the index-th word"""
+        return self._key_bytes(index).decode("utf-8")
+
+    def keys(self):
+        """Yield every word in sorted order without touching the payload region"""
+        for index in range(self.count):
+            yield self.key(index)
+
+    def find(self, word):
+        """Binary-search the key block; returns the word's index or -1"""
+        target = word.encode("utf-8")  # UTF-8 byte order matches str code point order
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key_bytes(middle) < target:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.count and self._key_bytes(low) == target:
+            return low
+        return -1
+
+    def payload(self, index):
+        """Decode the (meaning, example) pair of the index-th entry"""
+        start, end = struct.unpack_from("<QQ", self._map,
+                                        self._payload_offsets + index * PAYLOAD_OFFSET.size)
+        start += self._payloads
+        end += self._payloads
+        if self.codec is not None:
+            return self.codec.get(self._map[start:end])
+        (meaning_length,) = MEANING_LENGTH.unpack_from(self._map, start)
+        start += MEANING_LENGTH.size
+        meaning = self._map[start:start + meaning_length].decode("utf-8")
+        example = self._map[start + meaning_length:end].decode("utf-8")
+        return meaning, example
+
+    def lookup(self, word):
+        """Return (meaning, example) for a word, or None if it is absent"""
+        index = self.find(word.lower())
+        return self.payload(index) if index >= 0 else None
+
+    def close(self):
+        self._map.close()
+
+
+def json_to_binary(json_filename, binary_filename, compress=False):
+    """Convert a dictionary.json file into the binary snapshot format"""
+    with open(json_filename, "r") as file:
+        words = json.load(file)
+    # Keyed by lowercase word so case-variant duplicates collapse like they do in the tree
+    entries = sorted({word.lower(): (word.lower(), data["meaning"], data.get("example", ""))
+                      for word, data in words.items()}.values())
+    with open(binary_filename, "wb") as file:
+        write_binary(file, entries, compress)
+
+
+def binary_to_json(binary_filename, json_filename):
+    """Export a binary snapshot back to the dictionary.json format"""
+    snapshot = BinarySnapshot(binary_filename)
+    words = {}
+    for index in range(len(snapshot)):
+        meaning, example = snapshot.payload(index)
+        words[snapshot.key(index)] = {"meaning": meaning, "example": example}
+    snapshot.close()
+    with open(json_filename, "w") as file:
+        json.dump(words, file, indent=4)
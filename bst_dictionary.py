@@ -15,36 +15,258 @@
 
 
 
-import json
+import collections
+import contextlib
 import random
 import datetime
+import re
+import sys
+import threading
+import time
 
-class Node:
+from fuzzy_index import FuzzyIndex
+from metrics import Metrics
+from payload_codec import PayloadCodec
+from recent_searches import RecentSearches
+from rwlock import ReadWriteLock
+from text_index import InvertedIndex
+from storage import open_backend, write_snapshot
+
+_NO_LOCK = contextlib.nullcontext()  # Stands in for every lock when thread_safe is off
+# Public methods timed by enable_instrumentation()
+INSTRUMENTED_OPERATIONS = ("search", "insert", "delete", "save_to_file", "load_from_file")
+SCAN_CHUNK = 256  # Nodes a thread-safe range scan reads per hold of the read lock
+
+class TreeNode:
+    """The tree fields shared by every node; subclasses decide how meaning and example are held"""
+    # Fixed attribute slots instead of a per-instance __dict__ keep large trees compact.
+    # Subclasses set these fields inline rather than via super().__init__, which
+    # would add a call per node to bulk_load
+    __slots__ = ("word", "left", "right", "height", "size")
+
+class Node(TreeNode):
     """A node in the Binary Search Tree representing a dictionary entry"""
+    __slots__ = ("meaning", "example_sentence")
+
     def __init__(self, word, meaning, example_sentence=""):
         self.word = word.lower()  # Store word in lowercase for case-insensitive comparison
         self.meaning = meaning
         self.example_sentence = example_sentence
         self.left = None  # Left child pointer
         self.right = None  # Right child pointer
+        self.height = 1  # Height of the subtree rooted at this node (leaf = 1)
+        self.size = 1  # Number of words in the subtree rooted at this node
+
+class LazyNode(TreeNode):
+    """A node whose meaning and example are fetched from storage on first access"""
+    __slots__ = ("_source", "_index", "_meaning", "_example_sentence")
+
+    def __init__(self, word, source, index):
+        self.word = word
+        self.left = None
+        self.right = None
+        self.height = 1
+        self.size = 1
+        self._source = source  # Object with payload(index) -> (meaning, example)
+        self._index = index
+        self._meaning = None
+        self._example_sentence = None
+
+    def _load_payload(self):
+        """Fetch the payload once and drop the reference to its source"""
+        source = self._source  # Read once: another reader may be loading it too
+        if source is not None:
+            self._meaning, self._example_sentence = source.payload(self._index)
+            self._source = None
+
+    @property
+    def meaning(self):
+        self._load_payload()
+        return self._meaning
+
+    @meaning.setter
+    def meaning(self, value):
+        self._load_payload()
+        self._meaning = value
+
+    @property
+    def example_sentence(self):
+        self._load_payload()
+        return self._example_sentence
+
+    @example_sentence.setter
+    def example_sentence(self, value):
+        self._load_payload()
+        self._example_sentence = value
+
+class CompressedNode(TreeNode):
+    """A node holding its meaning and example as one compressed payload, decoded on access"""
+    __slots__ = ("_payload", "_codec")
+
+    def __init__(self, word, payload, codec):
+        self.word = word.lower()
+        self.left = None
+        self.right = None
+        self.height = 1
+        self.size = 1
+        self._payload = payload  # Bytes from codec.compress(meaning, example)
+        self._codec = codec  # PayloadCodec that compressed it, with the decompressed-entry cache
+
+    @property
+    def meaning(self):
+        return self._codec.get(self._payload)[0]
+
+    @meaning.setter
+    def meaning(self, value):
+        self._payload = self._codec.compress(value, self.example_sentence)
+
+    @property
+    def example_sentence(self):
+        return self._codec.get(self._payload)[1]
+
+    @example_sentence.setter
+    def example_sentence(self, value):
+        self._payload = self._codec.compress(self.meaning, value)
 
 class BSTDictionary:
-    """Binary Search Tree implementation of a dictionary"""
-    def __init__(self):
+    """Self-balancing (AVL) Binary Search Tree implementation of a dictionary"""
+    def __init__(self, filename="dictionary.json", autoload=True, journal_limit=1000,
+                 write_behind=False, flush_interval=1.0, backend=None, cache_size=0,
+                 history_size=50, thread_safe=False, instrument=False, metrics_hook=None,
+                 compress_payloads=False):
+        self.filename = filename  # File used for persistence
+        # Storage backend chosen from the filename unless one is given
+        self.backend = backend or open_backend(filename, journal_limit, compress_payloads)
+        # Meanings/examples are kept compressed in memory when a codec is set;
+        # bulk_load() retrains its preset dictionary on the loaded text
+        self.codec = PayloadCodec() if compress_payloads else None
+        self.write_behind = write_behind  # Flush from a background worker instead of inline
         self.root = None  # Root node of the BST
-        self.recent_searches = []  # List to track recent word lookups
-        self.load_from_file()  # Load existing dictionary data
+        # Bounded, de-duplicated history of successful lookups, kept across sessions
+        self.recent_searches = RecentSearches(history_size, filename + ".recent")
+        self._fuzzy_index = None  # Segment index of words, built on first suggest_corrections()
+        self._text_index = None  # Inverted index of definitions, built on first search_text()
+        self._index_build_lock = threading.Lock()  # One index build at a time
+        self._index_changes = None  # Words edited while an index is being built, else None
+        self._generation = 0  # Bumped whenever the whole tree is replaced
+        self.cache_size = cache_size  # Capacity of the search() LRU cache; 0 disables it
+        self._cache = collections.OrderedDict()  # word -> Node (or None for a miss), LRU last
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._cache_evictions = 0
+        self._pending = []  # Mutation records not yet written to storage
+        self._batch_records = None  # Records collected by an open batch()
+        self._batch_depth = 0  # Nesting level of batch() blocks
+        self._lock = threading.RLock()  # Guards tree mutations and pending records
+        # Shared lock for lookups, exclusive for mutations; no-ops when single-threaded
+        self._rwlock = ReadWriteLock() if thread_safe else None
+        self._read_lock = self._rwlock.read if thread_safe else _NO_LOCK
+        self._write_lock = self._rwlock.write if thread_safe else _NO_LOCK
+        # Readers share the LRU cache, so its bookkeeping needs its own mutex
+        self._cache_lock = threading.Lock() if thread_safe else _NO_LOCK
+        self._flush_lock = threading.RLock()  # Serializes writes to the backend
+        self._flush_thread = None  # Write-behind worker
+        self._stop_flushing = threading.Event()
+        self.metrics = None  # Metrics collector while instrumentation is enabled
+        if instrument or metrics_hook is not None:
+            self.enable_instrumentation(metrics_hook)
+        if autoload:
+            self.load_from_file()  # Load existing dictionary data
+            self.recent_searches.load()
         self.word_of_the_day = self.get_word_of_the_day()  # Initialize word of the day
+        if write_behind:
+            self._flush_thread = threading.Thread(target=self._flush_periodically,
+                                                  args=(flush_interval,), daemon=True)
+            self._flush_thread.start()
+
+    @classmethod
+    def from_sorted_entries(cls, entries, filename="dictionary.json", **options):
+        """Build a dictionary from (word, meaning, example) tuples without any file I/O"""
+        dictionary = cls(filename, autoload=False, **options)
+        dictionary.bulk_load(entries)
+        dictionary.word_of_the_day = dictionary.get_word_of_the_day()
+        return dictionary
+
+    def bulk_load(self, entries):
+        """Replace the tree with a perfectly balanced one built in a single O(n) pass.
+
+        Entries are expected in ascending word order (as written by save_to_file);
+        unsorted input is sorted first, and the last duplicate of a word wins.
+        Nothing is written to disk.
+        """
+        entries = [(word.lower(), meaning, example) for word, meaning, example in entries]
+        if any(entries[i][0] >= entries[i + 1][0] for i in range(len(entries) - 1)):
+            # Fall back to sorting; dict() keeps the last meaning for duplicate words
+            entries = sorted(dict((word, (word, meaning, example))
+                                  for word, meaning, example in entries).values())
+        codec = self.codec
+        if codec is None:
+            make_node = lambda index: Node(*entries[index])  # noqa: E731
+        else:
+            # Retrain the preset dictionary on the text being loaded
+            codec = PayloadCodec.trained(((meaning, example) for _, meaning, example in entries),
+                                         cache_size=codec.cache_size)
+            make_node = lambda index: self._new_node(*entries[index], codec=codec)  # noqa: E731
+        root = self._build_balanced(make_node, 0, len(entries))
+        with self._write_lock, self._lock:
+            self._reset_indexes()
+            self._cache.clear()
+            self.codec = codec
+            self.root = root
+
+    def load_lazy(self, count, word_at, source):
+        """Replace the tree with balanced LazyNodes for count sorted words.
+
+        word_at(index) returns the index-th word; source.payload(index) is only
+        called when that node's meaning or example is first read.
+        """
+        root = self._build_balanced(
+            lambda index: LazyNode(word_at(index), source, index), 0, count)
+        with self._write_lock, self._lock:
+            self._reset_indexes()
+            self._cache.clear()
+            self.root = root
+
+    def _new_node(self, word, meaning, example_sentence="", codec=None):
+        """Create a Node, or a CompressedNode when payload compression is on"""
+        codec = codec or self.codec
+        if codec is None:
+            return Node(word, meaning, example_sentence)
+        return CompressedNode(word, codec.compress(meaning, example_sentence), codec)
+
+    def _build_balanced(self, make_node, start, end):
+        """Helper method building a balanced subtree from the sorted items [start, end)"""
+        if start >= end:
+            return None
+        middle = (start + end) // 2
+        node = make_node(middle)
+        node.left = self._build_balanced(make_node, start, middle)
+        node.right = self._build_balanced(make_node, middle + 1, end)
+        self._update_height(node)
+        return node
 
     def insert(self, word, meaning, example_sentence=""):
         """Public method to insert a new word into the dictionary"""
-        self.root = self._insert_recursive(self.root, word, meaning, example_sentence)
-        self.save_to_file()  # Save changes to file after insertion
+        with self._write_lock, self._lock:
+            if self._text_index is not None:
+                self._unindex_text(word.lower())  # Drop the old definition, if any
+            self.root = self._insert_recursive(self.root, word, meaning, example_sentence)
+            if self._index_changes is not None:
+                self._index_changes.add(word.lower())  # Refreshed by the index build
+            if self._fuzzy_index is not None:
+                self._fuzzy_index.add(word.lower())
+            if self._text_index is not None:
+                self._text_index.add(word.lower(), self._document(meaning, example_sentence))
+            # Record the change in the journal instead of rewriting the whole file
+            self._record_mutation({"op": "insert", "word": word.lower(),
+                                   "meaning": meaning, "example": example_sentence})
+        self._flush_inline()  # Outside the locks so lookups are not blocked on disk I/O
 
     def _insert_recursive(self, node, word, meaning, example_sentence):
         """Helper method for recursive insertion of words"""
         if node is None:
-            return Node(word, meaning, example_sentence)
+            self._cache.pop(word.lower(), None)  # A cached miss is no longer valid
+            return self._new_node(word, meaning, example_sentence)
         if word.lower() < node.word:
             node.left = self._insert_recursive(node.left, word, meaning, example_sentence)
         elif word.lower() > node.word:
@@ -53,15 +275,284 @@ class BSTDictionary:
             # Update existing word's meaning and example
             node.meaning = meaning
             node.example_sentence = example_sentence
-        return node
+            return node
+        return self._rebalance(node)  # Restore the AVL property on the way back up
 
-    def search(self, word):
-        """Public method to search for a word in the dictionary"""
-        result = self._search_recursive(self.root, word.lower())
-        if result:
-            self.recent_searches.append(word.lower())  # Track successful searches
+    def search(self, word, record=True):
+        """Public method to search for a word; record=False keeps existence checks out of the history"""
+        if self._rwlock is None:
+            result = self._cached_search(word.lower())  # Skip the no-op lock on the hot path
+        else:
+            with self._read_lock:
+                result = self._cached_search(word.lower())
+        if result and record:
+            self.recent_searches.add(word.lower())  # Track successful searches
+        return result
+
+    def _cached_search(self, word):
+        """Look a word up through the LRU cache when one is configured"""
+        if self.cache_size <= 0:
+            return self._search_recursive(self.root, word)
+        with self._cache_lock:
+            if word in self._cache:
+                self._cache_hits += 1
+                self._cache.move_to_end(word)
+                return self._cache[word]
+            self._cache_misses += 1
+        # Walk the tree outside the cache lock; writers are excluded while we read
+        result = self._search_recursive(self.root, word)
+        with self._cache_lock:
+            self._cache[word] = result
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)  # Evict the least recently used word
+                self._cache_evictions += 1
         return result
 
+    def enable_instrumentation(self, hook=None):
+        """Start collecting the measurements reported by stats(); hook(event) also gets each one"""
+        self.metrics = Metrics(hook)
+        for name in INSTRUMENTED_OPERATIONS:
+            # Timed wrappers are instance attributes shadowing the class methods, so an
+            # uninstrumented dictionary runs the plain methods with no checks at all
+            setattr(self, name, self.metrics.timed(name, getattr(type(self), name).__get__(self),
+                                                   count_visits=name == "search"))
+        self._search_recursive = self._search_counted
+
+    def disable_instrumentation(self):
+        """Remove the timed wrappers and drop collected measurements"""
+        for name in INSTRUMENTED_OPERATIONS + ("_search_recursive",):
+            self.__dict__.pop(name, None)
+        self.metrics = None
+
+    def stats(self):
+        """Node count, tree height, cache counters and, when instrumented, per-operation metrics"""
+        stats = {
+            "nodes": len(self),
+            "height": self.get_height(),
+            "cache": self.cache_stats(),
+            "instrumented": self.metrics is not None,
+        }
+        if self.codec is not None:
+            stats["payload_cache"] = self.codec.cache_stats()
+        if self.metrics is not None:
+            stats.update(self.metrics.snapshot())
+        return stats
+
+    def compression_stats(self):
+        """Per-entry memory of payloads held compressed versus as plain strings (O(n) walk)"""
+        entries = compressed = plain = 0
+        with self._read_lock:
+            for node in self._iter_from(""):
+                if not isinstance(node, CompressedNode):
+                    continue
+                meaning, example = node._codec.decompress(node._payload)  # Bypasses the LRU cache
+                entries += 1
+                compressed += sys.getsizeof(node._payload)
+                plain += sys.getsizeof(meaning) + sys.getsizeof(example)
+        return {
+            "entries": entries,
+            "plain_bytes_per_entry": plain / entries if entries else 0.0,
+            "compressed_bytes_per_entry": compressed / entries if entries else 0.0,
+            "saved_bytes_per_entry": (plain - compressed) / entries if entries else 0.0,
+            "ratio": compressed / plain if plain else 0.0,
+            "dictionary_bytes": len(self.codec.zdict) if self.codec is not None else 0,
+        }
+
+    def cache_stats(self):
+        """Return hit/miss/eviction counters for the search() cache"""
+        lookups = self._cache_hits + self._cache_misses
+        return {
+            "capacity": self.cache_size,
+            "size": len(self._cache),
+            "hits": self._cache_hits,
+            "misses": self._cache_misses,
+            "evictions": self._cache_evictions,
+            "hit_rate": self._cache_hits / lookups if lookups else 0.0,
+        }
+
+    def get_suggestions(self, prefix, limit=5):
+        """Return up to limit words starting with prefix in O(log n + limit)"""
+        prefix = prefix.lower()
+        suggestions = []
+        with self._read_lock:
+            for node in self._iter_from(prefix):
+                if len(suggestions) >= limit or not node.word.startswith(prefix):
+                    break  # Past the block of words sharing the prefix
+                suggestions.append(node.word)
+        return suggestions
+
+    def suggest_corrections(self, word, limit=5, max_distance=2):
+        """Return up to limit words within max_distance (at most 2) edits of word, closest first"""
+        index = self._ensure_index("_fuzzy_index", self._build_fuzzy_index, self._refresh_fuzzy)
+        with self._read_lock:
+            return [match for _, match in index.search(word.lower(), max_distance, limit)]
+
+    def build_indexes(self):
+        """Build the suggest_corrections() and search_text() indexes now, not on first use"""
+        self._ensure_index("_fuzzy_index", self._build_fuzzy_index, self._refresh_fuzzy)
+        self._ensure_index("_text_index", self._build_text_index, self._refresh_text)
+
+    def _ensure_index(self, name, build, refresh):
+        """Return the index held in attribute name, building it first if it is missing.
+
+        build(nodes) reads the tree through _scan_from() and runs with no lock
+        held, so lookups and edits carry on meanwhile. Words edited during the
+        build are collected by insert()/delete() and passed to refresh(index,
+        nodes), as {word: current node or None}, before the index is
+        published; a build overtaken by a reload of the whole tree starts over.
+        """
+        index = getattr(self, name)
+        if index is not None:
+            return index
+        with self._index_build_lock:  # Concurrent callers build the index only once
+            index = getattr(self, name)
+            while index is None:
+                with self._lock:
+                    generation = self._generation
+                    self._index_changes = set()
+                built = build(self._scan_from(""))
+                with self._lock:
+                    changes, self._index_changes = self._index_changes, None
+                    if generation == self._generation:
+                        refresh(built, {word: self._search_recursive(self.root, word)
+                                        for word in changes})
+                        setattr(self, name, built)
+                        index = built
+        return index
+
+    def _reset_indexes(self):
+        """Drop the search indexes when the whole tree is replaced; called under self._lock"""
+        self._fuzzy_index = None  # Rebuilt lazily from the new tree
+        self._text_index = None
+        self._generation += 1  # A build still reading the old tree starts over
+
+    def _build_fuzzy_index(self, nodes):
+        """Index the words of nodes for suggest_corrections()"""
+        return FuzzyIndex(node.word for node in nodes)
+
+    def _refresh_fuzzy(self, index, nodes):
+        """Bring the words edited during the build up to date in a new fuzzy index"""
+        for word, node in nodes.items():
+            if node:
+                index.add(word)
+            else:
+                index.remove(word)
+
+    def search_text(self, query, limit=10):
+        """Reverse lookup: words whose meaning or example best match query (BM25 ranked)"""
+        index = self._ensure_index("_text_index", self._build_text_index, self._refresh_text)
+        with self._read_lock:
+            return [word for _, word in index.search(query, limit)]
+
+    def _build_text_index(self, nodes):
+        """Index the definitions of nodes for search_text()"""
+        index = InvertedIndex()
+        for node in nodes:
+            index.add(node.word, self._document(node.meaning, node.example_sentence))
+        return index
+
+    def _refresh_text(self, index, nodes):
+        """Bring the words edited during the build up to date in a new text index"""
+        index.remove_many(nodes)  # Which version the build saw is unknown, so drop them all
+        for word, node in nodes.items():
+            if node:
+                index.add(word, self._document(node.meaning, node.example_sentence))
+
+    def _document(self, meaning, example_sentence):
+        """Text indexed for a word by search_text()"""
+        return f"{meaning} {example_sentence}"
+
+    def _unindex_text(self, word):
+        """Remove a word's current definition from the text index"""
+        node = self._search_recursive(self.root, word)
+        if node:
+            self._text_index.remove(word, self._document(node.meaning, node.example_sentence))
+
+    def iter_range(self, low=None, high=None):
+        """Lazily yield nodes with low <= word <= high in order, visiting only that part of the tree"""
+        return self._iter_range(low, high)
+
+    def _scan_from(self, word):
+        """Nodes in ascending order from the first word >= word, safe to consume lazily.
+
+        In thread-safe mode the read lock is held only while a chunk of
+        SCAN_CHUNK nodes is read, never across a yield (that would block
+        writers for as long as the caller keeps the iterator). Each chunk
+        resumes after the last word seen, so words are still strictly
+        ascending, but writes may land between chunks.
+        """
+        if self._rwlock is None:
+            return self._iter_from(word)
+        return self._scan_chunks(word)
+
+    def _scan_chunks(self, word):
+        """Generator behind _scan_from() in thread-safe mode"""
+        last = None  # Last word of the previous chunk
+        while True:
+            chunk = []
+            with self._read_lock:
+                for node in self._iter_from(word if last is None else last):
+                    if node.word == last:
+                        continue  # Already yielded by the previous chunk
+                    chunk.append(node)
+                    if len(chunk) == SCAN_CHUNK:
+                        break
+                if chunk:
+                    last = chunk[-1].word  # Read under the lock; a delete may reuse the node
+            yield from chunk
+            if len(chunk) < SCAN_CHUNK:
+                return
+
+    def _iter_range(self, low, high):
+        """Generator behind iter_range()"""
+        for node in self._scan_from(low.lower() if low else ""):
+            if high is not None and node.word > high.lower():
+                break
+            yield node
+
+    def match_pattern(self, pattern):
+        """Lazily yield words matching a wildcard pattern ('?' = one letter, '*' = any run).
+
+        Only the key range sharing the pattern's literal prefix is scanned, and
+        patterns without '*' skip words of the wrong length before matching.
+        """
+        return self._match_pattern(pattern.lower())
+
+    def _match_pattern(self, pattern):
+        """Generator behind match_pattern()"""
+        prefix = re.split(r"[*?]", pattern, maxsplit=1)[0]
+        length = None if "*" in pattern else len(pattern)
+        regex = re.compile("".join(
+            ".*" if char == "*" else "." if char == "?" else re.escape(char)
+            for char in pattern) + r"\Z", re.DOTALL)
+        for node in self._scan_from(prefix):
+            if not node.word.startswith(prefix):
+                break  # Past the block of words sharing the literal prefix
+            if length is not None and len(node.word) != length:
+                continue
+            if regex.match(node.word):
+                yield node.word
+
+    def _iter_from(self, word):
+        """Lazily yield nodes in ascending order, starting at the first word >= word"""
+        stack = []
+        node = self.root
+        # Seek: remember every ancestor whose word is still >= the target
+        while node:
+            if word <= node.word:
+                stack.append(node)
+                node = node.left
+            else:
+                node = node.right
+        # In-order walk from the seek position
+        while stack:
+            node = stack.pop()
+            yield node
+            child = node.right
+            while child:
+                stack.append(child)
+                child = child.left
+
     def _search_recursive(self, node, word):
         """Helper method for recursive word search"""
         if node is None:
@@ -73,30 +564,144 @@ class BSTDictionary:
         else:
             return self._search_recursive(node.right, word)
 
-    def load_from_file(self, filename="dictionary.json"):
-        """Load dictionary data from a JSON file"""
+    def _search_counted(self, node, word):
+        """Iterative _search_recursive that reports how many nodes it compared"""
+        visited = 0
+        while node is not None:
+            visited += 1
+            if word == node.word:
+                break
+            node = node.left if word < node.word else node.right
+        self.metrics.add_visits(visited)
+        return node
+
+    def load_from_file(self, filename=None):
+        """Load the dictionary from its storage backend, or from another file if given"""
+        # Replayed records bypass the indexes, so rebuild them lazily
+        backend = self.backend if filename is None else open_backend(filename)
+        with self._write_lock:
+            with self._lock:
+                self._reset_indexes()
+            backend.load(self)
+
+    def apply_record(self, record):
+        """Apply a single mutation record to the tree without persisting it"""
+        with self._write_lock, self._lock:
+            if record["op"] == "insert":
+                self.root = self._insert_recursive(self.root, record["word"],
+                                                   record["meaning"], record["example"])
+            elif record["op"] == "delete":
+                self.root = self._delete_recursive(self.root, record["word"])
+            elif record["op"] == "batch":
+                for child in record["records"]:
+                    self.apply_record(child)
+
+    def _record_mutation(self, record):
+        """Queue a mutation record; called under self._lock so records keep tree order"""
+        if self._batch_records is not None:
+            self._batch_records.append(record)
+        else:
+            self._pending.append(record)
+
+    def _flush_inline(self):
+        """Write queued records now unless batching or in write-behind mode"""
+        if not self.write_behind and self._batch_records is None:
+            self.flush()
+
+    @contextlib.contextmanager
+    def batch(self):
+        """Group the mutations made inside the block into a single storage write.
+
+        The group is written as one record (one journal line, one transaction),
+        so a crash persists either all of it or none of it. Mutations already
+        applied in memory are persisted even if the block raises. Flushes and
+        compactions wait until the block ends, since the snapshots they take
+        would otherwise hold part of the group.
+        """
+        # The flush lock waits out a flush in progress; its snapshots must not see the group
+        with self._flush_lock, self._lock:
+            self._batch_depth += 1
+            if self._batch_depth == 1:
+                self._batch_records = []
         try:
-            with open(filename, "r") as file:
-                content = file.read().strip()
-                if content:
-                    words = json.loads(content)
-                    for word, data in words.items():
-                        self.insert(word, data["meaning"], data.get("example", ""))
-        except FileNotFoundError:
-            print("No dictionary file found. Starting fresh.")
-        except json.JSONDecodeError:
-            print("Error decoding dictionary file. Starting fresh.")
-
-    def save_to_file(self, filename="dictionary.json"):
-        """Save dictionary data to a JSON file"""
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    records, self._batch_records = self._batch_records, None
+                    if records:
+                        self._pending.append({"op": "batch", "records": records})
+            if not self.write_behind:
+                self.flush()  # No-op while an enclosing batch is still open
+
+    def flush(self):
+        """Hand all pending records to the storage backend in one write; deferred during a batch"""
+        with self._flush_lock:
+            with self._lock:
+                # batch() opens under these locks too, so none can start before the write
+                if not self._pending or self._batch_records is not None:
+                    return
+                records, self._pending = self._pending, []
+            started = time.perf_counter()
+            written = self.backend.write(self, records)
+            if self.metrics is not None:
+                self.metrics.observe_persist("journal", written, time.perf_counter() - started)
+
+    def _flush_periodically(self, interval):
+        """Write-behind worker: flush dirty state every interval until close()"""
+        while not self._stop_flushing.wait(interval):
+            self.flush()  # Skipped while a batch is open
+            self.recent_searches.save()
+
+    def compact(self, background=False):
+        """Ask the storage backend to fold superseded records into a fresh snapshot.
+
+        Does nothing while a batch is open; the next flush past the journal limit compacts.
+        """
+        with self._flush_lock:
+            with self._lock:
+                if self._batch_records is not None:
+                    return
+            self.backend.compact(self, background)
+
+    def close(self):
+        """Stop the write-behind worker, flush pending records and close the backend"""
+        if self._flush_thread is not None:
+            self._stop_flushing.set()
+            self._flush_thread.join()
+            self._flush_thread = None
+        self.flush()
+        self.recent_searches.save()
+        with self._flush_lock:
+            self.backend.close()
+
+    def save_to_file(self, filename=None):
+        """Save the whole dictionary to the backend, or export it to another file if given"""
+        started = time.perf_counter()
+        if filename is None:
+            # Hold the flush lock across the snapshot so every record already
+            # written to storage is included in what replaces it
+            with self._flush_lock:
+                written = self.backend.save(self.snapshot_words())
+        else:
+            written = write_snapshot(filename, self.snapshot_words(),
+                                     compress=self.codec is not None)
+        if self.metrics is not None:
+            self.metrics.observe_persist("snapshot", written, time.perf_counter() - started)
+
+    def snapshot_words(self, low=None, high=None):
+        """Return a consistent {word: {"meaning", "example"}} copy of the tree, or of words in [low, high)"""
         words = {}
-        self._save_recursive(self.root, words)
-        try:
-            with open(filename, "w") as file:
-                json.dump(words, file, indent=4)
-            print("Dictionary saved successfully.")
-        except Exception as e:
-            print(f"Error saving dictionary: {e}")
+        with self._lock:
+            if low is None and high is None:
+                self._save_recursive(self.root, words)
+                return words
+            for node in self._iter_from(low or ""):
+                if high is not None and node.word >= high:
+                    break
+                words[node.word] = {"meaning": node.meaning, "example": node.example_sentence}
+        return words
 
     def _save_recursive(self, node, words):
         """Helper method for recursive saving of dictionary data"""
@@ -110,17 +715,62 @@ class BSTDictionary:
 
     def get_word_of_the_day(self):
         """Select a random word that changes daily using date as seed"""
-        words = self.inorder_traversal()
-        if words:
-            # Use today's date as seed for consistent daily word
-            random.seed(datetime.date.today().toordinal())
-            return random.choice(words)
+        if self.root:
+            # A private RNG seeded with today's date gives a consistent daily word
+            # without reseeding the global random module
+            rng = random.Random(datetime.date.today().toordinal())
+            with self._read_lock:
+                if not self.root:
+                    return None
+                node = self.select(rng.randrange(len(self)))
+                return (node.word, node.meaning, node.example_sentence)
         return None
 
+    def __len__(self):
+        """Number of words in the dictionary, in O(1)"""
+        return self._size(self.root)
+
+    def rank(self, word):
+        """Return how many words sort before word (its index if present), in O(log n)"""
+        word = word.lower()
+        rank = 0
+        with self._read_lock:
+            node = self.root
+            while node:
+                if word <= node.word:
+                    node = node.left
+                else:
+                    rank += self._size(node.left) + 1
+                    node = node.right
+        return rank
+
+    def select(self, index):
+        """Return the node holding the index-th smallest word, in O(log n)"""
+        with self._read_lock:
+            if not 0 <= index < len(self):
+                raise IndexError("dictionary index out of range")
+            node = self.root
+            while True:
+                left_size = self._size(node.left)
+                if index < left_size:
+                    node = node.left
+                elif index == left_size:
+                    return node
+                else:
+                    index -= left_size + 1
+                    node = node.right
+
+    def sample(self, count, rng=None):
+        """Return count distinct random nodes, e.g. for quizzes"""
+        rng = rng or random.Random()
+        with self._read_lock:
+            return [self.select(index) for index in rng.sample(range(len(self)), count)]
+
     def inorder_traversal(self):
         """Public method for inorder traversal of the BST"""
         words = []
-        self._inorder_recursive(self.root, words)
+        with self._read_lock:
+            self._inorder_recursive(self.root, words)
         return words
 
     def _inorder_recursive(self, node, words):
@@ -132,8 +782,16 @@ class BSTDictionary:
 
     def delete(self, word):
         """Public method to delete a word from the dictionary"""
-        self.root = self._delete_recursive(self.root, word.lower())
-        self.save_to_file()  # Save changes after deletion
+        with self._write_lock, self._lock:
+            if self._text_index is not None:
+                self._unindex_text(word.lower())
+            self.root = self._delete_recursive(self.root, word.lower())
+            if self._index_changes is not None:
+                self._index_changes.add(word.lower())
+            if self._fuzzy_index is not None:
+                self._fuzzy_index.remove(word.lower())
+            self._record_mutation({"op": "delete", "word": word.lower()})  # Record the deletion
+        self._flush_inline()
 
     def _delete_recursive(self, node, word):
         """Helper method for recursive deletion of words"""
@@ -144,22 +802,110 @@ class BSTDictionary:
         elif word > node.word:
             node.right = self._delete_recursive(node.right, word)
         else:
+            # The word's node is unlinked, so drop it
+            self._cache.pop(word, None)
             # Node with only one child or no child
             if node.left is None:
                 return node.right
             elif node.right is None:
                 return node.left
-            # Node with two children
-            min_larger_node = self._find_min(node.right)
-            node.word = min_larger_node.word
-            node.meaning = min_larger_node.meaning
-            node.example_sentence = min_larger_node.example_sentence
-            node.right = self._delete_recursive(node.right, min_larger_node.word)
-        return node
+            # Node with two children: relink its in-order successor in its place rather
+            # than copying the successor's word into it, so a node never changes word
+            # under a reader holding it (a chunked scan, the search cache)
+            successor = self._find_min(node.right)
+            successor.right = self._remove_min(node.right)
+            successor.left = node.left
+            node = successor
+        return self._rebalance(node)  # Restore the AVL property on the way back up
+
+    def _remove_min(self, node):
+        """Unlink the minimum node of a subtree and return the rebalanced subtree"""
+        if node.left is None:
+            return node.right
+        node.left = self._remove_min(node.left)
+        return self._rebalance(node)
 
     def _find_min(self, node):
         """Helper method to find the minimum value node in a subtree"""
         current = node
         while current.left is not None:
             current = current.left
-        return current
\ No newline at end of file
+        return current
+
+    def check_invariants(self):
+        """Return a list of BST order, AVL balance and height/size violations (empty if valid)"""
+        problems = []
+        with self._read_lock:
+            self._check_recursive(self.root, None, None, problems)
+        return problems
+
+    def _check_recursive(self, node, low, high, problems):
+        """Helper method verifying a subtree; returns its actual (height, size)"""
+        if node is None:
+            return 0, 0
+        if (low is not None and node.word <= low) or (high is not None and node.word >= high):
+            problems.append(f"{node.word!r} is out of order")
+        left_height, left_size = self._check_recursive(node.left, low, node.word, problems)
+        right_height, right_size = self._check_recursive(node.right, node.word, high, problems)
+        height = 1 + max(left_height, right_height)
+        size = 1 + left_size + right_size
+        if abs(left_height - right_height) > 1:
+            problems.append(f"{node.word!r} is unbalanced")
+        if node.height != height or node.size != size:
+            problems.append(f"{node.word!r} has stale height or size")
+        return height, size
+
+    def get_height(self):
+        """Return the height of the tree (0 for an empty dictionary)"""
+        return self._height(self.root)
+
+    def _height(self, node):
+        """Helper method returning the stored height of a subtree"""
+        return node.height if node else 0
+
+    def _size(self, node):
+        """Helper method returning the stored word count of a subtree"""
+        return node.size if node else 0
+
+    def _update_height(self, node):
+        """Recompute a node's height and subtree size from its children"""
+        node.height = 1 + max(self._height(node.left), self._height(node.right))
+        node.size = 1 + self._size(node.left) + self._size(node.right)
+
+    def _balance_factor(self, node):
+        """Difference between left and right subtree heights"""
+        return self._height(node.left) - self._height(node.right)
+
+    def _rotate_left(self, node):
+        """Rotate a subtree to the left and return its new root"""
+        pivot = node.right
+        node.right = pivot.left
+        pivot.left = node
+        self._update_height(node)
+        self._update_height(pivot)
+        return pivot
+
+    def _rotate_right(self, node):
+        """Rotate a subtree to the right and return its new root"""
+        pivot = node.left
+        node.left = pivot.right
+        pivot.right = node
+        self._update_height(node)
+        self._update_height(pivot)
+        return pivot
+
+    def _rebalance(self, node):
+        """Rebalance a subtree after insertion or deletion so heights stay O(log n)"""
+        self._update_height(node)
+        balance = self._balance_factor(node)
+        if balance > 1:
+            # Left-heavy: a left-right case needs an extra rotation first
+            if self._balance_factor(node.left) < 0:
+                node.left = self._rotate_left(node.left)
+            return self._rotate_right(node)
+        if balance < -1:
+            # Right-heavy: a right-left case needs an extra rotation first
+            if self._balance_factor(node.right) > 0:
+                node.right = self._rotate_right(node.right)
+            return self._rotate_left(node)
+        return node
\ No newline at end of file
@@ -0,0 +1,274 @@
+# Streaming bulk importer for large word lists.
+#
+# Input (CSV, JSON Lines or the dictionary.json format) is read in chunks.
+# Each chunk is parsed, normalized, sorted and written to a temporary run
+# file, optionally on a process pool, so memory stays bounded by the chunk
+# size. The runs are then k-way merged with the current dictionary under a
+# conflict policy, the tree is rebuilt with bulk_load, and the result is
+# persisted with a single save.
+#
+#   word,meaning,example                      (CSV; a header row is optional)
+#   {"word": "...", "meaning": "...", "example": "..."}   (JSON Lines)
+#   {"word": {"meaning": "...", "example": "..."}, ...}    (dictionary.json)
+
+import csv
+import heapq
+import json
+import os
+import tempfile
+from itertools import groupby, islice
+
+FORMATS = ("csv", "jsonl", "json")
+CONFLICT_POLICIES = ("replace", "keep", "error")  # What happens when an imported word already exists
+EXISTING = -1  # Sequence number given to words already in the dictionary
+
+
+def detect_format(filename):
+    """Guess the input format from the file extension"""
+    extension = os.path.splitext(filename)[1].lower()
+    if extension == ".csv":
+        return "csv"
+    if extension in (".jsonl", ".ndjson"):
+        return "jsonl"
+    if extension == ".json":
+        return "json"
+    raise ValueError(f"cannot tell the format of {filename}; pass one of {', '.join(FORMATS)}")
+
+
+def iter_raw_records(file, format):
+    """Yield unparsed-or-lightly-parsed records; workers finish parsing them"""
+    if format == "csv":
+        rows = csv.reader(file)
+        first = next(rows, None)
+        if first is not None and [cell.strip().lower() for cell in first[:2]] != ["word", "meaning"]:
+            yield first  # No header row
+        yield from rows
+    elif format == "jsonl":
+        for line in file:
+            if line.strip():
+                yield line  # json.loads runs in the worker
+    elif format == "json":
+        yield from iter_json_object(file)
+    else:
+        raise ValueError(f"unknown format: {format}")
+
+
+def iter_json_object(file, block_size=1 << 16):
+    """Yield (key, value) pairs of a top-level JSON object without loading the whole file"""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    eof = False
+
+    def more():
+        nonlocal buffer, position, eof
+        block = file.read(block_size)
+        if not block:
+            eof = True
+        buffer = buffer[position:] + block  # Drop what has been consumed
+        position = 0
+
+    def skip_whitespace():
+        nonlocal position
+        while True:
+            while position < len(buffer) and buffer[position].isspace():
+                position += 1
+            if position < len(buffer) or eof:
+                return
+            more()
+
+    def expect(characters):
+        nonlocal position
+        skip_whitespace()
+        if position >= len(buffer) or buffer[position] not in characters:
+            raise ValueError(f"malformed JSON: expected one of {characters!r}")
+        position += 1
+        return buffer[position - 1]
+
+    def decode():
+        nonlocal position
+        while True:
+            skip_whitespace()
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                more()
+                continue
+            if end == len(buffer) and not eof:
+                more()  # A value touching the end of the buffer may be cut short
+                continue
+            position = end
+            return value
+
+    more()
+    expect("{")
+    skip_whitespace()
+    if position < len(buffer) and buffer[position] == "}":
+        return
+    while True:
+        key = decode()
+        expect(":")
+        yield key, decode()
+        if expect(",}") == "}":
+            return
+
+
+def normalize(format, record):
+    """Return (word, meaning, example) for one raw record, or None if it is unusable"""
+    try:
+        if format == "csv":
+            word, meaning = record[0], record[1]
+            example = record[2] if len(record) > 2 else ""
+        elif format == "jsonl":
+            entry = json.loads(record)
+            word, meaning, example = entry["word"], entry["meaning"], entry.get("example", "")
+        else:
+            word, data = record
+            meaning, example = data["meaning"], data.get("example", "")
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+    if not isinstance(word, str) or not isinstance(meaning, str):
+        return None
+    word = word.strip().lower()
+    meaning = meaning.strip()
+    if not word or not meaning:
+        return None
+    return word, meaning, (example or "").strip() if isinstance(example, str) else ""
+
+
+def sort_chunk(format, records, chunk_index, directory):
+    """Normalize and sort one chunk into a run file; runs in a worker process.
+
+    Returns (run filename, accepted, rejected). Each run line is
+    [word, chunk_index, position, meaning, example] so that merged runs order
+    duplicates by their position in the input.
+    """
+    entries = {}
+    rejected = 0
+    for position, record in enumerate(records):
+        entry = normalize(format, record)
+        if entry is None:
+            rejected += 1
+            continue
+        entries[entry[0]] = (position, entry)  # A later duplicate replaces an earlier one
+    filename = os.path.join(directory, f"run{chunk_index:06d}.jsonl")
+    with open(filename, "w", encoding="utf-8") as run:
+        for word in sorted(entries):
+            position, (_, meaning, example) = entries[word]
+            run.write(json.dumps([word, chunk_index, position, meaning, example]) + "\n")
+    return filename, len(records) - rejected, rejected
+
+
+def iter_run(filename):
+    """Yield the (word, chunk, position, meaning, example) tuples of a run file"""
+    with open(filename, "r", encoding="utf-8") as run:
+        for line in run:
+            yield tuple(json.loads(line))
+
+
+def iter_chunks(iterable, size):
+    """Split an iterable into lists of at most size items"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def write_runs(filename, format, directory, workers, chunk_size, encoding="utf-8"):
+    """Split the input into sorted run files; returns (run filenames, accepted, rejected)"""
+    runs = []
+    accepted = rejected = 0
+    with open(filename, "r", encoding=encoding, newline="") as file:
+        chunks = enumerate(iter_chunks(iter_raw_records(file, format), chunk_size))
+        if workers <= 1:
+            results = (sort_chunk(format, chunk, index, directory) for index, chunk in chunks)
+            for run, ok, bad in results:
+                runs.append(run)
+                accepted += ok
+                rejected += bad
+            return runs, accepted, rejected
+        from concurrent.futures import ProcessPoolExecutor  # Only needed with several workers
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Keep only a few chunks in flight so parsing never races ahead of the pool
+            pending = []
+            for index, chunk in chunks:
+                pending.append(pool.submit(sort_chunk, format, chunk, index, directory))
+                if len(pending) >= workers * 2:
+                    run, ok, bad = pending.pop(0).result()
+                    runs.append(run)
+                    accepted += ok
+                    rejected += bad
+            for future in pending:
+                run, ok, bad = future.result()
+                runs.append(run)
+                accepted += ok
+                rejected += bad
+    return runs, accepted, rejected
+
+
+def merge_entries(existing, runs, on_conflict, counts):
+    """Yield the merged (word, meaning, example) entries in word order.
+
+    existing is the dictionary's current entries in word order. Within the
+    import the last occurrence of a word wins; against existing words the
+    conflict policy decides. counts is updated with added/replaced/kept.
+    """
+    current = ((word, EXISTING, 0, meaning, example) for word, meaning, example in existing)
+    merged = heapq.merge(current, *(iter_run(run) for run in runs))
+    for word, group in groupby(merged, key=lambda entry: entry[0]):
+        group = list(group)  # Sorted by (chunk, position); an existing word comes first
+        old = group[0] if group[0][1] == EXISTING else None
+        new = group[-1] if group[-1][1] != EXISTING else None
+        if new is None:
+            yield word, old[3], old[4]
+        elif old is None:
+            counts["added"] += 1
+            yield word, new[3], new[4]
+        elif on_conflict == "keep":
+            counts["kept"] += 1
+            yield word, old[3], old[4]
+        elif on_conflict == "error":
+            raise ValueError(f'"{word}" is already in the dictionary')
+        else:
+            counts["replaced"] += 1
+            yield word, new[3], new[4]
+
+
+def import_file(dictionary, filename, format=None, on_conflict="replace", workers=None,
+                chunk_size=50000, save=True):
+    """Import a word list into the dictionary and persist it with one save.
+
+    format is detected from the extension when not given. workers is the
+    number of parsing processes (default: CPU count; 1 parses in this
+    process). Nothing changes if the input holds a conflict under the
+    "error" policy. Cannot run inside batch(). Returns counts of added,
+    replaced, kept and rejected entries.
+    """
+    format = format or detect_format(filename)
+    if format not in FORMATS:
+        raise ValueError(f"unknown format: {format}")
+    if on_conflict not in CONFLICT_POLICIES:
+        raise ValueError(f"unknown conflict policy: {on_conflict}")
+    if dictionary._batch_records is not None:
+        # The batch's records would be journaled after the import's snapshot
+        # and replayed over it on the next load
+        raise ValueError("cannot import inside batch()")
+    # Likewise persist write-behind records now, so the snapshot supersedes them
+    dictionary.flush()
+    workers = workers or os.cpu_count() or 1
+    counts = {"added": 0, "replaced": 0, "kept": 0}
+    with tempfile.TemporaryDirectory() as directory:
+        runs, accepted, rejected = write_runs(filename, format, directory, workers, chunk_size)
+        existing = ((node.word, node.meaning, node.example_sentence)
+                    for node in dictionary.iter_range())
+        entries = list(merge_entries(existing, runs, on_conflict, counts))
+    dictionary.bulk_load(entries)
+    if save:
+        dictionary.save_to_file()
+    counts.update(read=accepted + rejected, rejected=rejected, total=len(entries))
+    return counts
@@ -0,0 +1,171 @@
+# Headless command-line entry point for the dictionary.
+# Uses only bst_dictionary (no Kivy), so it starts quickly and runs on servers.
+#
+# Examples:
+#   echo apple | python dictionary_cli.py lookup
+#   python dictionary_cli.py lookup words.txt > results.jsonl
+#   python dictionary_cli.py insert new_words.jsonl
+#   python dictionary_cli.py delete old_words.txt
+#   python dictionary_cli.py import big_list.csv --on-conflict keep
+#   python dictionary_cli.py --dictionary dictionary.db lookup words.txt
+
+import argparse
+import contextlib
+import json
+import sys
+
+from bst_dictionary import BSTDictionary
+
+
+def read_lines(path):
+    """Yield (line number, line) for stripped, non-empty lines of a file, or of stdin when path is None or '-'"""
+    stream = sys.stdin if path in (None, "-") else open(path, "r", encoding="utf-8")
+    try:
+        for number, line in enumerate(stream, 1):
+            line = line.strip()
+            if line:
+                yield number, line
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def write_result(args, result):
+    """Emit one JSON Lines result"""
+    args.output.write(json.dumps(result) + "\n")
+
+
+def lookup(dictionary, args):
+    """Look up each input word and report a hit with its definition, or a miss with suggestions"""
+    for _, word in read_lines(args.input):
+        node = dictionary.search(word, record=False)  # Batch lookups stay out of the history
+        if node:
+            write_result(args, {"word": node.word, "status": "hit",
+                                "meaning": node.meaning, "example": node.example_sentence})
+        else:
+            write_result(args, {"word": word.lower(), "status": "miss",
+                                "suggestions": dictionary.suggest_corrections(word, args.suggestions)})
+    return 0
+
+
+def parse_entry(line):
+    """Return (word, meaning, example) from one JSON Lines entry; raises ValueError if it is unusable"""
+    try:
+        entry = json.loads(line)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"invalid JSON: {e}")
+    if not isinstance(entry, dict):
+        raise ValueError("entry must be a JSON object")
+    fields = (entry.get("word"), entry.get("meaning"), entry.get("example", ""))
+    for name, value in zip(("word", "meaning", "example"), fields):
+        if not isinstance(value, str):
+            raise ValueError(f'"{name}" must be a string')
+    # Same rules as the GUI and bulk import: surrounding spaces dropped, word and meaning required
+    word, meaning, example = (value.strip() for value in fields)
+    if not word or not meaning:
+        raise ValueError('"word" and "meaning" must not be empty')
+    return word, meaning, example
+
+
+def insert(dictionary, args):
+    """Insert JSON Lines entries ({"word", "meaning", "example"}) as one persisted batch.
+
+    Every line is validated first; if any is unusable its error is reported
+    and nothing is inserted.
+    """
+    entries = []
+    errors = 0
+    for number, line in read_lines(args.input):
+        try:
+            entries.append(parse_entry(line))
+        except ValueError as e:
+            write_result(args, {"status": "error", "line": number, "error": str(e)})
+            errors += 1
+    if errors:
+        write_result(args, {"status": "inserted", "count": 0, "errors": errors})
+        return 1
+    with dictionary.batch():
+        for word, meaning, example in entries:
+            dictionary.insert(word, meaning, example)
+    write_result(args, {"status": "inserted", "count": len(entries)})
+    return 0
+
+
+def delete(dictionary, args):
+    """Delete the listed words (one per line) as one persisted batch"""
+    count = 0
+    with dictionary.batch():
+        for _, word in read_lines(args.input):
+            if dictionary.search(word, record=False):
+                dictionary.delete(word)
+                count += 1
+            else:
+                write_result(args, {"word": word.lower(), "status": "miss"})
+    write_result(args, {"status": "deleted", "count": count})
+    return 0
+
+
+def bulk_import(dictionary, args):
+    """Stream a large CSV/JSON Lines/JSON word list into the dictionary and save it once"""
+    from bulk_import import import_file  # Keeps lookup/insert/delete start-up lean
+
+    try:
+        counts = import_file(dictionary, args.input, args.format, args.on_conflict,
+                             args.workers, args.chunk_size)
+    except ValueError as e:
+        write_result(args, {"status": "error", "error": str(e)})
+        return 1
+    write_result(args, dict(status="imported", **counts))
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Batch dictionary lookups and edits (JSON Lines output).")
+    parser.add_argument("--dictionary", default="dictionary.json",
+                        help="dictionary file (.json, .bin or .db); default: dictionary.json")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    lookup_parser = commands.add_parser("lookup", help="look up words, one per line")
+    lookup_parser.add_argument("input", nargs="?", help="input file (default: stdin)")
+    lookup_parser.add_argument("--suggestions", type=int, default=5,
+                               help="maximum suggestions reported for a miss")
+    lookup_parser.set_defaults(handler=lookup)
+
+    insert_parser = commands.add_parser("insert", help="insert JSON Lines entries")
+    insert_parser.add_argument("input", nargs="?", help="input file (default: stdin)")
+    insert_parser.set_defaults(handler=insert)
+
+    delete_parser = commands.add_parser("delete", help="delete words, one per line")
+    delete_parser.add_argument("input", nargs="?", help="input file (default: stdin)")
+    delete_parser.set_defaults(handler=delete)
+
+    import_parser = commands.add_parser("import", help="bulk import a CSV, JSON Lines or JSON word list")
+    import_parser.add_argument("input", help="input file")
+    # Values are checked by import_file, so the parser need not import bulk_import
+    import_parser.add_argument("--format",
+                               help="csv, jsonl or json (default: from the file extension)")
+    import_parser.add_argument("--on-conflict", default="replace",
+                               help="replace, keep or error: what to do with words "
+                                    "already in the dictionary (default: replace)")
+    import_parser.add_argument("--workers", type=int,
+                               help="parsing processes (default: CPU count)")
+    import_parser.add_argument("--chunk-size", type=int, default=50000,
+                               help="entries parsed and sorted per chunk (bounds memory)")
+    import_parser.set_defaults(handler=bulk_import)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.output = sys.stdout
+    # The dictionary reports status with print(); keep that off the JSON Lines stream
+    with contextlib.redirect_stdout(sys.stderr):
+        dictionary = BSTDictionary(args.dictionary)
+        try:
+            return args.handler(dictionary, args)
+        finally:
+            dictionary.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
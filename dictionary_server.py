@@ -0,0 +1,155 @@
+# Asyncio lookup service sharing one loaded dictionary between processes.
+#
+# Protocol: newline-delimited JSON over TCP or a Unix socket. Each request is
+# one JSON object with an "op" and an optional "id" that is echoed back;
+# clients may pipeline any number of requests without waiting, and responses
+# come back in request order on the same connection.
+#
+#   {"id": 1, "op": "lookup", "word": "apple"}
+#   {"id": 2, "op": "suggest", "prefix": "ap", "limit": 5}
+#   {"id": 3, "op": "insert", "word": "kiwi", "meaning": "...", "example": "..."}
+#   {"id": 4, "op": "delete", "word": "kiwi"}
+#   {"id": 5, "op": "batch", "requests": [{"op": "lookup", "word": "apple"}, ...]}
+#
+# Run:
+#   python dictionary_server.py --port 8765
+#   python dictionary_server.py --unix /tmp/dictionary.sock
+
+import argparse
+import asyncio
+import json
+import signal
+
+from bst_dictionary import BSTDictionary
+
+MAX_REQUEST_BYTES = 16 * 1024 * 1024  # Largest accepted request line (batches can be big)
+
+
+def field(request, key, kind=str, default=None):
+    """Return request[key] (or default if given and absent), checking its type"""
+    value = request[key] if default is None else request.get(key, default)
+    if not isinstance(value, kind) or isinstance(value, bool):
+        raise TypeError(f"{key!r} must be {'a string' if kind is str else 'an integer'}")
+    return value
+
+
+class DictionaryServer:
+    """Serves one BSTDictionary to many clients from a single event loop"""
+    def __init__(self, dictionary):
+        self.dictionary = dictionary
+        self.connections = 0  # Currently connected clients
+
+    def handle_request(self, request):
+        """Execute one request and return its response object"""
+        response = {"id": request.get("id")} if isinstance(request, dict) else {"id": None}
+        try:
+            op = request["op"]
+            if op == "lookup":
+                word = field(request, "word")
+                node = self.dictionary.search(word, record=False)
+                if node:
+                    response.update(ok=True, status="hit", word=node.word,
+                                    meaning=node.meaning, example=node.example_sentence)
+                else:
+                    response.update(ok=True, status="miss", word=word.lower())
+            elif op == "suggest":
+                response.update(ok=True, suggestions=self.dictionary.get_suggestions(
+                    field(request, "prefix"), field(request, "limit", int, 5)))
+            elif op == "insert":
+                # Validate every field before touching the tree, with the GUI's rules
+                word, meaning = field(request, "word").strip(), field(request, "meaning").strip()
+                example = field(request, "example", str, "").strip()
+                if not word or not meaning:
+                    raise ValueError("'word' and 'meaning' must not be empty")
+                self.dictionary.insert(word, meaning, example)
+                response.update(ok=True)
+            elif op == "delete":
+                word = field(request, "word")
+                found = self.dictionary.search(word, record=False) is not None
+                if found:
+                    self.dictionary.delete(word)
+                response.update(ok=True, deleted=found)
+            elif op == "batch":
+                if not isinstance(request["requests"], list):
+                    raise TypeError("'requests' must be a list")
+                # Mutations in a batch are persisted together
+                with self.dictionary.batch():
+                    responses = [self.handle_request(item) for item in request["requests"]]
+                response.update(ok=True, responses=responses)
+            else:
+                response.update(ok=False, error=f"unknown op: {op}")
+        except (KeyError, TypeError, ValueError) as e:
+            response.update(ok=False, error=f"malformed request: {e}")
+        except Exception as e:  # One bad request must not drop the connection
+            response.update(ok=False, error=f"request failed: {e!r}")
+        return response
+
+    async def handle_client(self, reader, writer):
+        """Answer pipelined requests from one connection in order"""
+        self.connections += 1
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:  # Request longer than MAX_REQUEST_BYTES
+                    writer.write(b'{"id": null, "ok": false, "error": "request too large"}\n')
+                    break
+                if not line:
+                    break
+                try:
+                    response = self.handle_request(json.loads(line))
+                except (ValueError, RecursionError) as e:  # Also invalid UTF-8, too deeply nested
+                    response = {"id": None, "ok": False, "error": f"invalid JSON: {e}"}
+                writer.write(json.dumps(response).encode("utf-8") + b"\n")
+                # Only wait for the socket when our output is backing up, so
+                # pipelined requests are answered without a round trip each
+                if writer.transport.get_write_buffer_size() > 64 * 1024:
+                    await writer.drain()
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.connections -= 1
+            writer.close()
+
+    async def serve(self, host=None, port=None, unix_path=None):
+        """Listen on a Unix socket if unix_path is given, otherwise on TCP"""
+        if unix_path:
+            server = await asyncio.start_unix_server(self.handle_client, unix_path,
+                                                     limit=MAX_REQUEST_BYTES)
+        else:
+            server = await asyncio.start_server(self.handle_client, host, port,
+                                                limit=MAX_REQUEST_BYTES, backlog=4096)
+        # Stop cleanly on Ctrl+C or SIGTERM so the caller can flush the dictionary
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop.set)
+            except NotImplementedError:  # Not available on Windows
+                pass
+        async with server:
+            await stop.wait()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve a dictionary over JSON Lines.")
+    parser.add_argument("--dictionary", default="dictionary.json",
+                        help="dictionary file (.json, .bin or .db); default: dictionary.json")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="listen on this Unix socket path instead of TCP")
+    args = parser.parse_args(argv)
+
+    # Write-behind keeps journal fsyncs off the event loop
+    dictionary = BSTDictionary(args.dictionary, write_behind=True)
+    try:
+        asyncio.run(DictionaryServer(dictionary).serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        dictionary.close()
+
+
+if __name__ == "__main__":
+    main()
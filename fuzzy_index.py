@@ -0,0 +1,173 @@
+# Segment index used by the dictionary for typo-tolerant "did you mean" lookups.
+#
+# Each word is cut into MAX_DISTANCE + 2 segments. An edit changes at most one
+# segment, so a word within e edits of the query keeps at least
+# MAX_DISTANCE + 2 - e segments intact, each shifted by at most e positions.
+# A query therefore looks up its own substrings at those positions, counts the
+# segments each word matched, and only computes the edit distance for words
+# with enough matches -- a few buckets instead of the whole vocabulary.
+
+MAX_DISTANCE = 2  # Largest distance the segments are cut for
+SEGMENTS = MAX_DISTANCE + 2
+
+
+def edit_distance(first, second, max_distance=None):
+    """Levenshtein distance between two words.
+
+    When max_distance is given, the computation stops early and returns
+    max_distance + 1 as soon as the distance is known to exceed it.
+    """
+    # Shared prefixes and suffixes never contribute to the distance
+    start = 0
+    while start < len(first) and start < len(second) and first[start] == second[start]:
+        start += 1
+    first, second = first[start:], second[start:]
+    while first and second and first[-1] == second[-1]:
+        first, second = first[:-1], second[:-1]
+    if len(first) < len(second):
+        first, second = second, first
+    if not second:
+        return len(first)
+    if max_distance is not None and len(first) - len(second) > max_distance:
+        return max_distance + 1
+    previous = list(range(len(second) + 1))
+    for i, first_char in enumerate(first, 1):
+        current = [i]
+        left = i
+        for j, second_char in enumerate(second):
+            # Cheapest of deletion, insertion and substitution
+            cost = previous[j] if first_char == second_char else previous[j] + 1
+            above = previous[j + 1] + 1
+            if above < cost:
+                cost = above
+            if left + 1 < cost:
+                cost = left + 1
+            current.append(cost)
+            left = cost
+        if max_distance is not None and min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+    return previous[-1]
+
+
+def segment_bounds(length):
+    """(start, length) of each of the SEGMENTS near-equal segments of a word of this length"""
+    bounds = []
+    start = 0
+    for remaining in range(SEGMENTS, 0, -1):
+        size = (length - start) // remaining
+        bounds.append((start, size))
+        start += size
+    return bounds
+
+
+class FuzzyIndex:
+    """Words bucketed by (length, segment number, segment text) for edit distance search"""
+    def __init__(self, words=()):
+        self.buckets = {}  # (length, segment number, segment text) -> [word, ...]
+        # Words of at most MAX_DISTANCE letters can match with no segment intact,
+        # so they are checked directly on every query
+        self.short = set()
+        self.size = 0
+        for word in words:
+            self.add(word)
+
+    def __len__(self):
+        return self.size
+
+    def add(self, word):
+        """Index a word; adding a word already present does nothing"""
+        if len(word) <= MAX_DISTANCE:
+            if word not in self.short:
+                self.short.add(word)
+                self.size += 1
+            return
+        first = True
+        for number, (start, size) in enumerate(segment_bounds(len(word))):
+            if not size:
+                continue
+            key = (len(word), number, word[start:start + size])
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                self.buckets[key] = [word]
+            elif first and word in bucket:
+                return  # Already indexed
+            else:
+                bucket.append(word)
+            first = False
+        self.size += 1
+
+    def remove(self, word):
+        """Remove a word from the index if present"""
+        if word in self.short:
+            self.short.discard(word)
+            self.size -= 1
+            return
+        for number, (start, size) in enumerate(segment_bounds(len(word))):
+            if not size:
+                continue
+            key = (len(word), number, word[start:start + size])
+            bucket = self.buckets.get(key)
+            if bucket is None or word not in bucket:
+                return  # Not indexed
+            bucket.remove(word)
+            if not bucket:
+                del self.buckets[key]
+            if number == SEGMENTS - 1:
+                self.size -= 1
+
+    def __iter__(self):
+        """Yield all indexed words (in no particular order)"""
+        yield from self.short
+        last = SEGMENTS - 1
+        for (_, number, _), bucket in self.buckets.items():
+            if number == last:
+                yield from bucket
+
+    def search(self, word, max_distance=2, limit=5):
+        """Return up to limit (distance, word) pairs within max_distance, closest first.
+
+        Distances are tried in increasing order, so a query with enough close
+        matches never gathers the wider and more numerous candidates.
+        """
+        if max_distance > MAX_DISTANCE:
+            raise ValueError(f"max_distance can be at most {MAX_DISTANCE}")
+        matches = []
+        checked = set()
+        for distance in range(max_distance + 1):
+            for candidate in self._candidates(word, distance):
+                if candidate not in checked:
+                    checked.add(candidate)
+                    found = edit_distance(word, candidate, max_distance)
+                    if found <= max_distance:
+                        matches.append((found, candidate))
+            # Unchecked words are all further than distance, so these are final
+            if sum(1 for found, _ in matches if found <= distance) >= limit:
+                break
+        matches.sort()
+        return matches[:limit]
+
+    def _candidates(self, word, distance):
+        """Yield every indexed word that may be within distance edits of word"""
+        yield from self.short
+        for length in range(max(0, len(word) - distance), len(word) + distance + 1):
+            bounds = segment_bounds(length)
+            # Segments left intact, counting empty ones which always "match"
+            needed = SEGMENTS - distance - sum(1 for _, size in bounds if not size)
+            shift = len(word) - length
+            hits = {}  # Candidate -> bit mask of the segments it matched
+            for number, (start, size) in enumerate(bounds):
+                if not size:
+                    continue
+                bit = 1 << number
+                # An intact segment moves by the net insertions before it, bounded both by
+                # distance and by the edits still needed to make up the length difference
+                lowest = max(0, start - distance, start + shift - distance)
+                highest = min(len(word) - size, start + distance, start + shift + distance)
+                for position in range(lowest, highest + 1):
+                    key = (length, number, word[position:position + size])
+                    for candidate in self.buckets.get(key, ()):
+                        hits[candidate] = hits.get(candidate, 0) | bit
+            for candidate, mask in hits.items():
+                if bin(mask).count("1") >= needed:  # int.bit_count() needs Python 3.10
+                    yield candidate
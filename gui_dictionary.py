@@ -14,27 +14,36 @@
 
 # Run the app here:
 
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import islice
+
+STARTED = time.perf_counter()  # Before the Kivy imports, for the startup timing report
+
 from kivy.core.window import Window
 from kivy.metrics import dp
-from kivy.properties import NumericProperty
+from kivy.properties import NumericProperty, ObjectProperty, StringProperty
 from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from kivy.uix.recycleview import RecycleView
 from kivy.uix.widget import Widget
 from kivy.animation import Animation
 from kivy.clock import Clock
 from kivymd.app import MDApp
-from kivymd.toast import toast
 from kivymd.uix.boxlayout import MDBoxLayout
 from kivymd.uix.button import MDRaisedButton, MDIconButton
 from kivymd.uix.card import MDCard
 from kivymd.uix.label import MDLabel
-from kivymd.uix.list import OneLineListItem, MDList, TwoLineListItem
-from kivymd.uix.menu import MDDropdownMenu
+from kivymd.uix.list import OneLineListItem, TwoLineListItem
 from kivymd.uix.scrollview import MDScrollView
 from kivymd.uix.snackbar import MDSnackbar
 from kivymd.uix.textfield import MDTextField
 from kivymd.uix.toolbar import MDTopAppBar
 from kivymd.uix.bottomnavigation import MDBottomNavigation, MDBottomNavigationItem
-from bst_dictionary import BSTDictionary  
+# The dropdown menu, toast and the dictionary engine itself are imported
+# where they are first used so they stay off the path to the first frame
 
 # Set window size
 Window.size = (320, 550)
@@ -54,11 +63,17 @@ class SmallToast(MDLabel):
         self.text_color = (1, 1, 1, 1)
 
 class RecentSearchItem(TwoLineListItem):
-    """Custom list item for recent searches with delete functionality"""
-    def __init__(self, word, delete_callback, search_callback, **kwargs):
+    """Recyclable list item for recent searches with delete functionality.
+
+    Instances are reused by a RecycleView, which assigns word and the two
+    callbacks from each data entry instead of building a new widget.
+    """
+    word = StringProperty("")
+    delete_callback = ObjectProperty(None, allownone=True)
+    search_callback = ObjectProperty(None, allownone=True)
+
+    def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.word = word
-        self.text = word
         self.secondary_text = "Recently searched"
         
         # Create container for delete button
@@ -75,15 +90,21 @@ class RecentSearchItem(TwoLineListItem):
             text_color=(0.8, 0, 0, 1),
             size_hint=(None, None),
             size=(40, 40),
-            on_release=lambda x: delete_callback(word)
+            on_release=lambda x: self.delete_callback(self.word)
         )
         
         self.delete_box.add_widget(delete_icon)
         self.add_widget(self.delete_box)
         self.bind(size=self._update_delete_box_pos)
-        
-        # Make the item clickable for searching
-        self.bind(on_release=lambda x: search_callback(word))
+
+    def on_word(self, instance, word):
+        """Show the word assigned by the RecycleView"""
+        self.text = word
+
+    def on_release(self):
+        """Make the item clickable for searching"""
+        if self.search_callback:
+            self.search_callback(self.word)
 
     def _update_delete_box_pos(self, instance, value):
         """Update the position of the delete button when the item size changes"""
@@ -94,6 +115,11 @@ class RecentSearchItem(TwoLineListItem):
 
 class DictionaryApp(MDApp):
     """Main application class for the Dictionary app"""
+
+    # Pause in typing (seconds) before suggestions are computed
+    SUGGESTION_DELAY = 0.15
+    # Rows in the recycled lists cost nothing extra, so show plenty of them
+    SUGGESTION_LIMIT = 50
     
     def show_snackbar(self, message):
         """Display a temporary notification message above the navigation tabs"""
@@ -113,8 +139,17 @@ class DictionaryApp(MDApp):
 
     def build(self):
         """Initialize and build the main UI structure"""
-        # Initialize dictionary backend
-        self.dictionary = BSTDictionary()
+        # The dictionary is loaded on a worker thread (see on_start); until it
+        # arrives the Search tab shows a loading state
+        self.dictionary = None
+        self.recent_list = None  # Built with the Recent tab on its first visit
+
+        # Suggestions are computed on a worker thread after a short typing pause
+        self._suggestion_executor = ThreadPoolExecutor(max_workers=1)
+        self._suggestion_future = None
+        self._suggestion_query = ""
+        self._suggestion_trigger = Clock.create_trigger(self._request_suggestions,
+                                                        self.SUGGESTION_DELAY)
         
         # Configure theme
         self.theme_cls.primary_palette = "Cyan"
@@ -153,11 +188,78 @@ class DictionaryApp(MDApp):
 
         main_layout.add_widget(bottom_nav)
         
-        # Initialize word of the day
-        Clock.schedule_once(lambda dt: self.update_word_of_day(), 0)
-        
+        self._set_loading(True)
+        Window.bind(on_flip=self._report_first_frame)
         return main_layout
 
+    def on_start(self):
+        """Start loading the dictionary once the window exists"""
+        threading.Thread(target=self._load_dictionary, daemon=True).start()
+
+    def on_stop(self):
+        """Finish pending dictionary writes before the app exits"""
+        try:
+            # shutdown(cancel_futures=True) needs Python 3.9; at most one query is queued
+            if self._suggestion_future is not None:
+                self._suggestion_future.cancel()
+            self._suggestion_executor.shutdown(wait=False)
+        finally:
+            if self.dictionary is not None:
+                self.dictionary.close()  # Flush write-behind edits and the search history
+
+    def _report_first_frame(self, *args):
+        """Log the time from process start to the first drawn frame"""
+        Window.unbind(on_flip=self._report_first_frame)
+        print(f"Startup: first frame after {(time.perf_counter() - STARTED) * 1000:.0f} ms")
+
+    def _load_dictionary(self):
+        """Worker thread: import and load the dictionary, then hand it to the UI thread"""
+        try:
+            from bst_dictionary import BSTDictionary
+
+            # Disk writes happen off the UI thread; repeated lookups are served from an LRU cache;
+            # thread_safe because suggestions read the tree from a worker thread
+            dictionary = BSTDictionary(write_behind=True, cache_size=512, thread_safe=True)
+        except Exception as e:
+            print(f"Error loading dictionary: {e}")
+            Clock.schedule_once(lambda dt: self._show_load_error(), 0)
+            return
+        Clock.schedule_once(partial(self._on_dictionary_loaded, dictionary), 0)
+        # Still on the worker: build the "did you mean" and meaning search indexes before first use.
+        # The build holds no tree lock, so the UI can already use the dictionary
+        dictionary.build_indexes()
+
+    def _on_dictionary_loaded(self, dictionary, dt):
+        """UI thread: switch from the loading state to the loaded dictionary"""
+        self.dictionary = dictionary
+        print(f"Startup: dictionary ready after {(time.perf_counter() - STARTED) * 1000:.0f} ms")
+        self._set_loading(False)
+        self.update_word_of_day()
+        # Show the history restored from the previous session
+        self.update_recent_searches_display()
+
+    def _show_load_error(self):
+        self.wod_word.text = ""
+        self.wod_meaning.text = "The dictionary could not be loaded."
+        self.search_input.hint_text = "Dictionary unavailable"
+
+    def _set_loading(self, loading):
+        """Show or clear the Search tab's loading state"""
+        self.search_input.disabled = loading
+        for button in self.search_buttons:
+            button.disabled = loading
+        self.search_input.hint_text = "Loading dictionary..." if loading else "Search for a word"
+        if loading:
+            self.wod_word.text = ""
+            self.wod_meaning.text = "Loading..."
+
+    def _dictionary_ready(self):
+        """True once the dictionary has loaded; otherwise tell the user to wait"""
+        if self.dictionary is None:
+            self.show_snackbar("The dictionary is still loading")
+            return False
+        return True
+
     def _create_search_tab(self):
         """Create and configure the search tab interface"""
         search_tab = MDBottomNavigationItem(name='search', text='Search', icon='magnify')
@@ -228,17 +330,25 @@ class DictionaryApp(MDApp):
             on_text_validate=self.search_word  # Add this line to handle Enter key
         )
         search_button = MDRaisedButton(text="Search", on_release=self.search_word)
+        # Reverse lookup mode: match the text against meanings and examples
+        meaning_button = MDRaisedButton(text="Search Meanings", on_release=self.search_meanings)
+        button_row = MDBoxLayout(
+            orientation='horizontal',
+            spacing=10,
+            size_hint_y=None,
+            height=dp(40)
+        )
+        button_row.add_widget(search_button)
+        button_row.add_widget(meaning_button)
+        self.search_buttons = (search_button, meaning_button)  # Disabled while loading
 
 
-        # Suggestion List
-        self.suggestion_list = MDList()
-        suggestion_scroll = MDScrollView(
-            size_hint=(1, None), 
-            #height=150,
-            do_scroll_x=False,
-            scroll_timeout=0
+        # Suggestion List, backed by a RecycleView that reuses its row widgets
+        self.suggestion_list = self._create_recycle_list(
+            OneLineListItem,
+            size_hint=(1, None),
+            height=dp(240)
         )
-        suggestion_scroll.add_widget(self.suggestion_list)
 
         # Result Card
         self.result_card = MDCard(
@@ -292,19 +402,33 @@ class DictionaryApp(MDApp):
         search_content.clear_widgets()
         search_content.add_widget(word_of_day_card)
         search_content.add_widget(self.search_input)
-        search_content.add_widget(search_button)
+        search_content.add_widget(button_row)
         search_content.add_widget(spacer)  # Add spacer here
         search_content.add_widget(self.result_card)
-        search_content.add_widget(suggestion_scroll)
+        search_content.add_widget(self.suggestion_list)
 
         search_scroll.add_widget(search_content)
         search_layout.add_widget(search_scroll)
         search_tab.add_widget(search_layout)
         return search_tab
 
+    def _create_lazy_tab(self, populate, **kwargs):
+        """Create a navigation tab whose content is built by populate(tab) on its first visit"""
+        tab = MDBottomNavigationItem(**kwargs)
+
+        def on_first_visit(*args):
+            tab.unbind(on_pre_enter=on_first_visit)
+            populate(tab)
+        tab.bind(on_pre_enter=on_first_visit)
+        return tab
+
     def _create_edit_tab(self):
-        """Create and configure the edit tab interface"""
-        edit_tab = MDBottomNavigationItem(name='edit', text='Edit', icon='pencil')
+        """Create the edit tab; its widgets are built when it is first opened"""
+        return self._create_lazy_tab(self._populate_edit_tab, name='edit', text='Edit',
+                                     icon='pencil')
+
+    def _populate_edit_tab(self, edit_tab):
+        """Build the edit tab interface"""
         edit_layout = MDBoxLayout(orientation='vertical', spacing=0, padding=8)
         
         # Main scroll view for edit tab
@@ -409,11 +533,14 @@ class DictionaryApp(MDApp):
         edit_scroll.add_widget(edit_content)
         edit_layout.add_widget(edit_scroll)
         edit_tab.add_widget(edit_layout)
-        return edit_tab
 
     def _create_recent_tab(self):
-        """Create and configure the recent searches tab interface"""
-        recent_tab = MDBottomNavigationItem(name='recent', text='Recent', icon='history')
+        """Create the recent searches tab; its widgets are built when it is first opened"""
+        return self._create_lazy_tab(self._populate_recent_tab, name='recent', text='Recent',
+                                     icon='history')
+
+    def _populate_recent_tab(self, recent_tab):
+        """Build the recent searches tab interface"""
         recent_layout = MDBoxLayout(
             orientation='vertical',
             spacing=10,
@@ -421,28 +548,15 @@ class DictionaryApp(MDApp):
             size_hint_y=1
         )
 
-        # Main scroll view for recent tab - increased height to 95%
-        recent_scroll = MDScrollView(
-            do_scroll_x=False,
-            scroll_timeout=0,
-            size_hint_y=5  # Increased from 0.9 to 0.95
-        )
-
-        recent_content = MDBoxLayout(
-            orientation='vertical',
-            spacing=10,
-            padding=10,
-            size_hint_y=None
+        # Recent list - a RecycleView taking most of the tab's height
+        self.recent_list = self._create_recycle_list(
+            RecentSearchItem,
+            row_height=dp(72),
+            size_hint_y=5
         )
-        recent_content.bind(minimum_height=recent_content.setter('height'))
 
-        # Recent list
-        self.recent_list = MDList()
-        recent_content.add_widget(self.recent_list)
-        recent_scroll.add_widget(recent_content)
-
-        # Add scroll view first
-        recent_layout.add_widget(recent_scroll)
+        # Add list first
+        recent_layout.add_widget(self.recent_list)
 
         # Clear History Button at the bottom with reduced spacing
         button_container = MDBoxLayout(
@@ -459,7 +573,21 @@ class DictionaryApp(MDApp):
         button_container.add_widget(clear_button)
         recent_layout.add_widget(button_container)
         recent_tab.add_widget(recent_layout)
-        return recent_tab
+        self.update_recent_searches_display()
+
+    def _create_recycle_list(self, viewclass, row_height=dp(48), **kwargs):
+        """Create a vertical RecycleView whose rows are reused as its data changes"""
+        recycle_view = RecycleView(do_scroll_x=False, scroll_timeout=0, **kwargs)
+        recycle_view.viewclass = viewclass
+        layout = RecycleBoxLayout(
+            orientation='vertical',
+            default_size=(None, row_height),
+            default_size_hint=(1, None),
+            size_hint_y=None
+        )
+        layout.bind(minimum_height=layout.setter('height'))
+        recycle_view.add_widget(layout)
+        return recycle_view
 
     def scroll_to_top(self, scroll_widget):
         """Smoothly scroll to the top of the given scroll widget"""
@@ -470,29 +598,72 @@ class DictionaryApp(MDApp):
         Animation(scroll_y=0, duration=0.3).start(scroll_widget)
 
     def get_suggestions(self, prefix):
-        """Get a list of words from the dictionary that start with the given prefix."""
-        words = self.dictionary.inorder_traversal()
-        return [word[0] for word in words if word[0].startswith(prefix)][:5]
+        """Get words starting with the given prefix, or matching it if it has * or ? wildcards."""
+        if "*" in prefix or "?" in prefix:
+            return list(islice(self.dictionary.match_pattern(prefix), self.SUGGESTION_LIMIT))
+        return self.dictionary.get_suggestions(prefix, self.SUGGESTION_LIMIT)
 
     def update_suggestions(self, instance, value):
-        """Update the suggestion list based on the user's input."""
-        value = value.strip().lower()
-        self.suggestion_list.clear_widgets()
+        """Debounce keystrokes, then compute suggestions off the UI thread."""
+        self._suggestion_query = value.strip().lower()
+        self._suggestion_trigger.cancel()  # Restart the debounce timer
+
+        if not self._suggestion_query:
+            if self._suggestion_future is not None:
+                self._suggestion_future.cancel()
+            self.suggestion_list.data = []
+            return
+
+        self._suggestion_trigger()
 
-        if not value:
+    def _request_suggestions(self, dt):
+        """Submit the current query to the worker, superseding any queued one."""
+        self._submit_query(self._suggestion_query, self.get_suggestions)
+
+    def search_meanings(self, *args):
+        """List the words whose meaning or example sentence matches the search text."""
+        if not self._dictionary_ready():
+            return
+        query = self.search_input.text.strip().lower()
+        if not query:
+            self.show_snackbar("Please enter text to search meanings")
             return
+        self._suggestion_trigger.cancel()
+        self._suggestion_query = query
+        self._submit_query(query, self.get_meaning_matches, f'No meanings match "{query}".')
 
-        suggestions = self.get_suggestions(value)
+    def get_meaning_matches(self, query):
+        """Get the words whose definitions best match the query."""
+        return self.dictionary.search_text(query, self.SUGGESTION_LIMIT)
 
-        for suggestion in suggestions:
-            item = OneLineListItem(
-                text=suggestion,
-                on_release=lambda x=suggestion: self.select_suggestion(x)
-            )
-            self.suggestion_list.add_widget(item)
+    def _submit_query(self, query, lookup, empty_message=None):
+        """Run lookup(query) on the worker and show the results in the suggestion list."""
+        if self.dictionary is None:
+            return
+        if self._suggestion_future is not None:
+            self._suggestion_future.cancel()  # No effect if it already started; discarded later
+        future = self._suggestion_executor.submit(lookup, query)
+        # Done callbacks run on the worker thread; hop back to the UI thread via Clock
+        future.add_done_callback(lambda done: Clock.schedule_once(
+            partial(self._show_suggestions, query, done, empty_message), 0))
+        self._suggestion_future = future
+
+    def _show_suggestions(self, query, future, empty_message, dt):
+        """Render worker results unless the text changed while they were computed."""
+        if future.cancelled() or query != self._suggestion_query:
+            return  # Stale response
+        if future.exception() is not None:
+            return
+        if not future.result() and empty_message:
+            self.show_snackbar(empty_message)
+        # Only the data changes; the RecycleView rebinds its existing rows
+        self.suggestion_list.data = [
+            {"text": suggestion, "on_release": partial(self.select_suggestion, suggestion)}
+            for suggestion in future.result()
+        ]
         
         # Auto scroll to top when new suggestions appear
-        Clock.schedule_once(lambda dt: self.scroll_to_top(self.suggestion_list.parent.parent), 0.1)
+        Clock.schedule_once(lambda dt: self.scroll_to_top(self.suggestion_list), 0.1)
 
     def select_suggestion(self, word):
         """Handle the selection of a suggestion."""
@@ -501,6 +672,8 @@ class DictionaryApp(MDApp):
 
     def open_menu(self, instance):
         """Create a dropdown menu with a nice theme toggle."""
+        from kivymd.uix.menu import MDDropdownMenu  # Only needed once the menu is opened
+
         menu_items = [
             {
                 "text": "Dark Mode" if self.theme_cls.theme_style == "Light" else "Light Mode",
@@ -526,6 +699,8 @@ class DictionaryApp(MDApp):
 
     def update_word_of_day(self):
         """Update the Word of the Day display with a new random word"""
+        if self.dictionary is None:
+            return
         word_of_day = self.dictionary.word_of_the_day
         if word_of_day:
             self.wod_word.text = word_of_day[0].upper()
@@ -540,11 +715,17 @@ class DictionaryApp(MDApp):
 
     def view_recent_searches(self):
         """Display recent searches in a toast."""
-        recent_words = ", ".join(self.dictionary.recent_searches[-5:])
+        from kivymd.toast import toast
+
+        if not self._dictionary_ready():
+            return
+        recent_words = ", ".join(self.dictionary.recent_searches.latest(5))
         toast(f"Recent Searches: {recent_words}" if recent_words else "No recent searches")
 
     def insert_word(self, instance):
         """Handle new word insertion into dictionary"""
+        if not self._dictionary_ready():
+            return
         word = self.word_input.text.strip().lower()
         meaning = self.meaning_input.text.strip()
         example = self.example_input.text.strip()
@@ -561,6 +742,8 @@ class DictionaryApp(MDApp):
 
     def search_word(self, *args):
         """Search for a word in the dictionary."""
+        if not self._dictionary_ready():
+            return
         word = self.search_input.text.strip().lower()
         if not word:
             self.show_snackbar("Please enter a word to search")
@@ -571,22 +754,36 @@ class DictionaryApp(MDApp):
             self.result_label.text = f'{result.word.upper()}'
             self.definition_label.text = f'{result.meaning}'
             self.usage_label.text = f'{result.example_sentence}' if result.example_sentence else ''
-            self.update_recent_searches(word)
+            self.update_recent_searches()  # search() already recorded the word
         else:
             # Clear the result card
             self.result_label.text = ''
             self.definition_label.text = ''
             self.usage_label.text = ''
-            # Show not found message in snackbar
-            self.show_snackbar(f'"{word}" not found. Go to Edit tab to add new words.')
+            # Look for close matches on the worker; the snackbar is shown from the UI thread
+            future = self._suggestion_executor.submit(self.dictionary.suggest_corrections, word, 3)
+            future.add_done_callback(lambda done: Clock.schedule_once(
+                partial(self._show_not_found, word, done), 0))
         
         # Update card height after content change
         Clock.schedule_once(lambda dt: self.update_result_card_height(), 0.1)
 
+    def _show_not_found(self, word, future, dt):
+        """Show the not found message, offering close matches if any"""
+        if future.cancelled():
+            return
+        corrections = future.result() if future.exception() is None else []
+        if corrections:
+            self.show_snackbar(f'"{word}" not found. Did you mean: {", ".join(corrections)}?')
+        else:
+            self.show_snackbar(f'"{word}" not found. Go to Edit tab to add new words.')
+
     def delete_word(self, instance):
         """Handle word deletion from dictionary"""
+        if not self._dictionary_ready():
+            return
         word = self.delete_input.text.strip().lower()
-        if self.dictionary.search(word):
+        if self.dictionary.search(word, record=False):  # Existence check only
             self.dictionary.delete(word)
             self.show_snackbar(f'Word "{word}" deleted!')
             # Clear input field
@@ -594,15 +791,13 @@ class DictionaryApp(MDApp):
         else:
             self.show_snackbar(f'Word "{word}" not found.')
 
-    def update_recent_searches(self, word):
-        """Update the recent searches list."""
-        if word in self.dictionary.recent_searches:
-            self.dictionary.recent_searches.remove(word)
-        self.dictionary.recent_searches.insert(0, word)
+    def update_recent_searches(self):
+        """Show the recent searches list after a successful search promoted a word in it."""
         self.update_recent_searches_display()
         
         # Auto scroll to top when new recent searches are added
-        Clock.schedule_once(lambda dt: self.scroll_to_top(self.recent_list.parent.parent), 0.1)
+        if self.recent_list is not None:
+            Clock.schedule_once(lambda dt: self.scroll_to_top(self.recent_list), 0.1)
 
     def search_word_directly(self, word):
         """Search for a word directly from recent searches."""
@@ -634,27 +829,30 @@ class DictionaryApp(MDApp):
 
     def clear_recent_searches(self, instance):
         """Clear all recent searches."""
+        if not self._dictionary_ready():
+            return
         self.dictionary.recent_searches.clear()
-        self.recent_list.clear_widgets()
+        self.recent_list.data = []
         self.show_snackbar('Recent searches cleared')
 
     def remove_recent_search(self, word):
         """Remove a word from recent searches."""
-        if word in self.dictionary.recent_searches:
-            self.dictionary.recent_searches.remove(word)
+        if self.dictionary.recent_searches.remove(word):
             self.show_snackbar(f'Removed "{word}" from recent searches')
             self.update_recent_searches_display()
 
     def update_recent_searches_display(self):
         """Update the display of recent searches."""
-        self.recent_list.clear_widgets()
-        for item in self.dictionary.recent_searches[:5]:
-            recent_item = RecentSearchItem(
-                item,
-                delete_callback=self.remove_recent_search,
-                search_callback=self.search_word_directly
-            )
-            self.recent_list.add_widget(recent_item)
+        if self.recent_list is None or self.dictionary is None:
+            return  # Filled in when the tab is built or the dictionary arrives
+        self.recent_list.data = [
+            {
+                "word": item,
+                "delete_callback": self.remove_recent_search,
+                "search_callback": self.search_word_directly
+            }
+            for item in self.dictionary.recent_searches
+        ]
 
 
 if __name__ == '__main__':
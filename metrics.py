@@ -0,0 +1,130 @@
+# Optional instrumentation for BSTDictionary: call counts, latency
+# histograms, nodes visited per lookup and bytes written per persist.
+# Nothing here runs unless instrumentation is enabled on a dictionary.
+
+import threading
+import time
+
+HISTOGRAM_BUCKETS = 40  # Powers of two; covers 1 us .. ~6 days, or 1 byte .. ~550 GB
+
+
+class Histogram:
+    """Log2-bucketed histogram of non-negative integers (microseconds, bytes, ...).
+
+    Bucket i counts values v with 2**(i-1) <= v < 2**i (bucket 0 holds 0),
+    so recording is O(1) and memory is fixed; percentiles are reported as
+    the upper bound of the bucket they fall in.
+    """
+    def __init__(self):
+        self.buckets = [0] * HISTOGRAM_BUCKETS
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def add(self, value):
+        value = int(value)
+        self.buckets[min(value.bit_length(), HISTOGRAM_BUCKETS - 1)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket holding the given fraction of values"""
+        if not self.count:
+            return 0
+        target = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= target:
+                return min((1 << index) - 1 if index else 0, self.max)
+        return self.max
+
+    def summary(self, unit):
+        """Plain dict of the histogram for stats(); keys are suffixed with unit"""
+        return {
+            "count": self.count,
+            f"mean_{unit}": self.total / self.count if self.count else 0.0,
+            f"p50_{unit}": self.percentile(0.50),
+            f"p99_{unit}": self.percentile(0.99),
+            f"max_{unit}": self.max,
+            # Non-empty buckets as {upper bound: count}
+            "buckets": {(1 << index) - 1 if index else 0: count
+                        for index, count in enumerate(self.buckets) if count},
+        }
+
+
+class Metrics:
+    """Collects per-operation measurements and forwards each one to an optional hook.
+
+    hook(event) receives a dict such as
+        {"operation": "search", "seconds": 2.1e-06, "nodes_visited": 14}
+        {"operation": "persist", "kind": "journal", "seconds": 0.004, "bytes": 120}
+    so measurements can be exported to statsd, Prometheus, logs, etc.
+    """
+    def __init__(self, hook=None):
+        self.hook = hook
+        self.latency = {}  # operation -> Histogram of microseconds
+        self.nodes_visited = Histogram()  # Tree nodes compared per search() (0 for cache hits)
+        self.bytes_written = {}  # persist kind ("journal"/"snapshot") -> Histogram of bytes
+        self._lock = threading.Lock()  # Readers may record concurrently in thread-safe mode
+        self._local = threading.local()  # Nodes visited by the current thread's lookup
+
+    def timed(self, operation, function, count_visits=False):
+        """Wrap a bound method so each call records its latency (and visits if asked)"""
+        clock = time.perf_counter
+        local = self._local
+
+        def timed_call(*args, **kwargs):
+            local.visits = 0
+            started = clock()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = clock() - started
+                self.observe(operation, elapsed, local.visits if count_visits else None)
+        timed_call.__name__ = function.__name__
+        timed_call.__doc__ = function.__doc__
+        return timed_call
+
+    def add_visits(self, count):
+        """Called by the counting tree walk during an instrumented lookup"""
+        self._local.visits = getattr(self._local, "visits", 0) + count
+
+    def observe(self, operation, seconds, nodes_visited=None):
+        """Record one call of operation"""
+        with self._lock:
+            histogram = self.latency.get(operation)
+            if histogram is None:
+                histogram = self.latency[operation] = Histogram()
+            histogram.add(seconds * 1e6)
+            if nodes_visited is not None:
+                self.nodes_visited.add(nodes_visited)
+        if self.hook is not None:
+            event = {"operation": operation, "seconds": seconds}
+            if nodes_visited is not None:
+                event["nodes_visited"] = nodes_visited
+            self.hook(event)
+
+    def observe_persist(self, kind, written, seconds):
+        """Record one storage write of written bytes (None if the backend can't tell)"""
+        written = written or 0
+        with self._lock:
+            histogram = self.bytes_written.get(kind)
+            if histogram is None:
+                histogram = self.bytes_written[kind] = Histogram()
+            histogram.add(written)
+        if self.hook is not None:
+            self.hook({"operation": "persist", "kind": kind, "seconds": seconds, "bytes": written})
+
+    def snapshot(self):
+        """Plain-dict copy of everything collected so far"""
+        with self._lock:
+            return {
+                "operations": {operation: histogram.summary("us")
+                               for operation, histogram in sorted(self.latency.items())},
+                "nodes_visited": self.nodes_visited.summary("nodes"),
+                "bytes_written": {kind: dict(histogram.summary("bytes"), total=histogram.total)
+                                  for kind, histogram in sorted(self.bytes_written.items())},
+            }
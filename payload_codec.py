@@ -0,0 +1,127 @@
+# Compression for the meaning/example payload of dictionary entries.
+#
+# Each entry is deflated on its own, so one definition can be decompressed
+# without touching its neighbours. Definitions are short, which leaves plain
+# deflate little to work with; a preset dictionary trained from the words
+# and phrases the definitions themselves use most gives it that context.
+#
+# Payload encoding before compression: uint32 meaning length, meaning,
+# example (UTF-8) -- the same layout as a binary snapshot's payload region.
+
+import collections
+import re
+import struct
+import threading
+import zlib
+
+MEANING_LENGTH = struct.Struct("<I")
+DICTIONARY_SIZE = 16 * 1024  # Bytes of preset dictionary; deflate can use up to 32 KiB
+TRAINING_SAMPLE = 2000  # Payloads sampled to train the preset dictionary
+CACHE_SIZE = 256  # Decompressed entries kept for repeated lookups
+LEVEL = 9
+WINDOW_BITS = -15  # Raw deflate: no zlib header or checksum stored per entry
+TOKEN = re.compile(rb"\S+\s*")
+
+
+def pack_payload(meaning, example):
+    """Encode a (meaning, example) pair as uncompressed payload bytes"""
+    meaning = meaning.encode("utf-8")
+    return MEANING_LENGTH.pack(len(meaning)) + meaning + example.encode("utf-8")
+
+
+def unpack_payload(data):
+    """Decode payload bytes back into a (meaning, example) pair"""
+    (meaning_length,) = MEANING_LENGTH.unpack_from(data, 0)
+    start = MEANING_LENGTH.size
+    return (data[start:start + meaning_length].decode("utf-8"),
+            data[start + meaning_length:].decode("utf-8"))
+
+
+def train_dictionary(payloads, size=DICTIONARY_SIZE):
+    """Build a zlib preset dictionary from sample payloads.
+
+    The words and two-word phrases that save the most bytes (occurrences
+    times length) are kept, most frequent last, since deflate reaches the
+    end of its dictionary with the shortest distances.
+    """
+    counts = collections.Counter()
+    for payload in payloads:
+        tokens = TOKEN.findall(payload[MEANING_LENGTH.size:])
+        counts.update(tokens)
+        counts.update(first + second for first, second in zip(tokens, tokens[1:]))
+    ranked = sorted((token for token, count in counts.items() if count > 1),
+                    key=lambda token: (counts[token] - 1) * len(token), reverse=True)
+    chosen = []
+    total = 0
+    for token in ranked:
+        if total + len(token) > size:
+            continue
+        chosen.append(token)
+        total += len(token)
+    chosen.sort(key=lambda token: counts[token])
+    return b"".join(chosen)
+
+
+class PayloadCodec:
+    """Compresses (meaning, example) pairs against a shared preset dictionary.
+
+    get() goes through a small LRU cache of decompressed entries, so showing
+    the same result again (or reading its meaning and then its example)
+    decompresses it once.
+    """
+    def __init__(self, zdict=b"", cache_size=CACHE_SIZE):
+        self.zdict = zdict
+        # Loading the preset dictionary dominates compressing a short payload, so it is
+        # done once here and each compress() starts from a copy of this primed state
+        self._compressor = zlib.compressobj(LEVEL, zlib.DEFLATED, WINDOW_BITS, zdict=zdict)
+        self.cache_size = cache_size
+        self._cache = collections.OrderedDict()  # compressed bytes -> (meaning, example)
+        self._cache_lock = threading.Lock()  # Readers share the cache in thread-safe mode
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    @classmethod
+    def trained(cls, pairs, sample=TRAINING_SAMPLE, **options):
+        """Return a codec whose preset dictionary is trained on an even sample of (meaning, example) pairs"""
+        pairs = list(pairs)
+        step = max(1, len(pairs) // sample)
+        return cls(train_dictionary(pack_payload(meaning, example)
+                                    for meaning, example in pairs[::step]), **options)
+
+    def compress(self, meaning, example):
+        """Return the compressed bytes of one entry"""
+        compressor = self._compressor.copy()
+        return compressor.compress(pack_payload(meaning, example)) + compressor.flush()
+
+    def decompress(self, payload):
+        """Decode one entry's compressed bytes, bypassing the cache"""
+        decompressor = zlib.decompressobj(WINDOW_BITS, self.zdict)
+        return unpack_payload(decompressor.decompress(payload) + decompressor.flush())
+
+    def get(self, payload):
+        """Decode one entry's compressed bytes through the LRU cache"""
+        with self._cache_lock:
+            pair = self._cache.get(payload)
+            if pair is not None:
+                self.cache_hits += 1
+                self._cache.move_to_end(payload)
+                return pair
+            self.cache_misses += 1
+        pair = self.decompress(payload)
+        if self.cache_size > 0:
+            with self._cache_lock:
+                self._cache[payload] = pair
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return pair
+
+    def cache_stats(self):
+        """Return hit/miss counters for the decompressed-entry cache"""
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            "capacity": self.cache_size,
+            "size": len(self._cache),
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "hit_rate": self.cache_hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,98 @@
+# Bounded most-recently-used history of searched words.
+
+import json
+import os
+import threading
+from collections import OrderedDict
+
+
+class RecentSearches:
+    """Bounded MRU list of words with O(1) promote, remove and evict.
+
+    Backed by an OrderedDict whose last key is the most recent search, so
+    re-searching a word moves it to the front instead of duplicating it.
+    Iterating yields words from most to least recent.
+    """
+    def __init__(self, capacity=50, filename=None):
+        self.capacity = capacity  # Oldest words are evicted beyond this size
+        self.filename = filename  # JSON file the history is persisted to, if any
+        self._words = OrderedDict()
+        self._lock = threading.Lock()  # save() may run on the write-behind worker
+        self._dirty = False  # Changed since the last load() or save()
+
+    def add(self, word):
+        """Record a search, promoting the word if it is already present"""
+        with self._lock:
+            if word in self._words:
+                self._words.move_to_end(word)
+            else:
+                self._words[word] = None
+                if len(self._words) > self.capacity:
+                    self._words.popitem(last=False)  # Evict the least recent word
+            self._dirty = True
+
+    def remove(self, word):
+        """Remove a word from the history; returns whether it was present"""
+        with self._lock:
+            if word not in self._words:
+                return False
+            del self._words[word]
+            self._dirty = True
+            return True
+
+    def clear(self):
+        with self._lock:
+            self._words.clear()
+            self._dirty = True
+
+    def latest(self, count):
+        """Return up to count words, most recent first"""
+        words = []
+        with self._lock:
+            for word in reversed(self._words):
+                if len(words) >= count:
+                    break
+                words.append(word)
+        return words
+
+    def __iter__(self):
+        return iter(self.latest(len(self._words)))
+
+    def __len__(self):
+        return len(self._words)
+
+    def __contains__(self, word):
+        return word in self._words
+
+    def load(self):
+        """Restore the history saved by a previous session"""
+        if not self.filename:
+            return
+        try:
+            with open(self.filename, "r") as file:
+                words = json.load(file)
+        except FileNotFoundError:
+            return
+        except json.JSONDecodeError:
+            print("Error decoding recent searches file. Starting fresh.")
+            return
+        with self._lock:
+            self._words.clear()
+            for word in reversed(words[:self.capacity]):  # Stored most recent first
+                self._words[word] = None
+            self._dirty = False
+
+    def save(self):
+        """Write the history if it changed; at most capacity words, so this is cheap"""
+        if not self.filename or not self._dirty:
+            return
+        with self._lock:
+            words = list(reversed(self._words))
+            self._dirty = False
+        temp_filename = self.filename + ".tmp"
+        try:
+            with open(temp_filename, "w") as file:
+                json.dump(words, file)
+            os.replace(temp_filename, self.filename)
+        except Exception as e:
+            print(f"Error saving recent searches: {e}")
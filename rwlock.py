@@ -0,0 +1,97 @@
+# Reader/writer lock used by BSTDictionary's thread-safe mode.
+
+import threading
+
+
+class ReadWriteLock:
+    """Many concurrent readers or one writer, alternating fairly between the two.
+
+    New readers queue behind a waiting writer, and each writer on release lets
+    the readers already waiting go before the next writer, so neither side starves.
+    Both sides are reentrant for the thread that holds them, and the writer
+    may also take the read side (a write lock already excludes everyone else).
+    Upgrading a read lock to a write lock is not supported.
+
+    Use the read and write attributes as context managers:
+        with lock.read: ...
+        with lock.write: ...
+    """
+    def __init__(self):
+        self._mutex = threading.Lock()
+        self._condition = threading.Condition(self._mutex)
+        self._readers = 0  # Threads currently holding the read side
+        self._waiting_readers = 0
+        self._waiting_writers = 0
+        self._reader_grants = 0  # Readers admitted ahead of queued writers by the last writer
+        self._writer = None  # Ident of the thread holding the write side
+        self._write_depth = 0
+        self._local = threading.local()  # Per-thread read depth for reentrancy
+        self.read = _Side(self.acquire_read, self.release_read)
+        self.write = _Side(self.acquire_write, self.release_write)
+
+    def acquire_read(self):
+        local = self._local
+        depth = getattr(local, "depth", 0)
+        if depth or self._writer == threading.get_ident():
+            local.depth = depth + 1  # Writers are already excluded on this thread
+            return
+        with self._mutex:  # The condition's own lock, entered without the Python wrapper
+            self._waiting_readers += 1
+            while self._writer is not None or (self._waiting_writers and not self._reader_grants):
+                self._condition.wait()
+            self._waiting_readers -= 1
+            if self._reader_grants:
+                self._reader_grants -= 1
+            self._readers += 1
+        local.depth = 1
+        local.shared = True  # Counted in self._readers rather than nested in a write
+
+    def release_read(self):
+        local = self._local
+        local.depth -= 1
+        if local.depth or not getattr(local, "shared", False):
+            return
+        local.shared = False
+        with self._mutex:
+            self._readers -= 1
+            if not self._readers:
+                self._condition.notify_all()
+
+    def acquire_write(self):
+        me = threading.get_ident()
+        if self._writer == me:
+            self._write_depth += 1
+            return
+        if getattr(self._local, "depth", 0):
+            raise RuntimeError("cannot upgrade a read lock to a write lock")
+        with self._mutex:
+            self._waiting_writers += 1
+            while self._writer is not None or self._readers or self._reader_grants:
+                self._condition.wait()
+            self._waiting_writers -= 1
+            self._writer = me
+            self._write_depth = 1
+
+    def release_write(self):
+        self._write_depth -= 1
+        if self._write_depth:
+            return
+        with self._mutex:
+            self._writer = None
+            self._reader_grants = self._waiting_readers
+            self._condition.notify_all()
+
+
+class _Side:
+    """Reusable context manager for one side of a ReadWriteLock"""
+    __slots__ = ("_acquire", "_release")
+
+    def __init__(self, acquire, release):
+        self._acquire = acquire
+        self._release = release
+
+    def __enter__(self):
+        self._acquire()
+
+    def __exit__(self, *exc_info):
+        self._release()
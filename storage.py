@@ -0,0 +1,484 @@
+# Storage backends used by BSTDictionary for persistence.
+#
+# A backend loads the tree when the dictionary starts, durably writes the
+# mutation records produced by insert/delete, and can rewrite everything
+# at once. BSTDictionary only ever talks to this interface, so the on-disk
+# layout can change without touching the tree code.
+
+import bisect
+import itertools
+import json
+import os
+import threading
+
+from binary_snapshot import BINARY_EXTENSION, BinarySnapshot, write_binary
+
+SQLITE_EXTENSIONS = (".db", ".sqlite", ".sqlite3")  # Filenames opened with SQLiteBackend
+SHARD_EXTENSION = ".shards"  # Directories opened with ShardedBackend
+# Shard i holds words from boundaries[i] up to boundaries[i + 1]: one shard per leading letter
+DEFAULT_SHARD_BOUNDARIES = [""] + list("bcdefghijklmnopqrstuvwxyz")
+PARALLEL_LOAD_BYTES = 4 * 1024 * 1024  # Smaller stores load faster without starting processes
+
+
+def open_backend(filename, journal_limit=1000, compress=False):
+    """Pick a storage backend from the filename's extension; compress applies to .bin snapshots"""
+    if filename.endswith(SQLITE_EXTENSIONS):
+        return SQLiteBackend(filename)
+    if filename.rstrip("/\\").endswith(SHARD_EXTENSION):
+        return ShardedBackend(filename)
+    return JSONBackend(filename, journal_limit, compress)
+
+
+def iter_records(records):
+    """Flatten batch records into their individual insert/delete records"""
+    for record in records:
+        if record["op"] == "batch":
+            yield from iter_records(record["records"])
+        else:
+            yield record
+
+
+def fsync_directory(filename):
+    """Persist a rename in the file's directory; not supported on every platform"""
+    try:
+        directory = os.open(os.path.dirname(os.path.abspath(filename)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(directory)
+    except OSError:
+        pass
+    finally:
+        os.close(directory)
+
+
+def write_snapshot(filename, words, announce=True, compress=False):
+    """Write to a temp file, fsync and rename so a crash never truncates the snapshot.
+
+    compress stores a binary snapshot's payloads deflated (ignored for JSON).
+    Returns the number of bytes written, or 0 if the save failed.
+    """
+    temp_filename = filename + ".tmp"
+    try:
+        if filename.endswith(BINARY_EXTENSION):
+            with open(temp_filename, "wb") as file:
+                write_binary(file, ((word, data["meaning"], data["example"])
+                                    for word, data in words.items()), compress)
+                file.flush()
+                os.fsync(file.fileno())
+                written = file.tell()
+        else:
+            with open(temp_filename, "w") as file:
+                json.dump(words, file, indent=4)
+                file.flush()
+                os.fsync(file.fileno())
+                written = file.tell()
+        os.replace(temp_filename, filename)
+        fsync_directory(filename)
+        if announce:
+            print("Dictionary saved successfully.")
+        return written
+    except Exception as e:
+        print(f"Error saving dictionary: {e}")
+        return 0
+
+
+def _row_bytes(row):
+    """UTF-8 size of a row's text columns"""
+    return sum(len(value.encode("utf-8")) for value in row)
+
+
+class StorageBackend:
+    """Interface between BSTDictionary and its persistent storage"""
+    def load(self, dictionary):
+        """Populate the dictionary's tree from storage"""
+        raise NotImplementedError
+
+    def write(self, dictionary, records):
+        """Durably persist a list of insert/delete/batch records, in order; returns bytes written"""
+        raise NotImplementedError
+
+    def save(self, words):
+        """Replace all stored data with words ({word: {"meaning", "example"}}); returns bytes written"""
+        raise NotImplementedError
+
+    def compact(self, dictionary, background=False):
+        """Reclaim space used by superseded records; optional"""
+
+    def close(self):
+        """Finish outstanding work and release files or connections"""
+
+
+class JSONBackend(StorageBackend):
+    """dictionary.json (or .bin) snapshot plus an append-only mutation journal.
+
+    Each write appends fsynced JSON lines to <filename>.journal. Once the
+    journal holds journal_limit records it is moved aside and a fresh
+    snapshot is written on a background thread via temp file + rename.
+    """
+    def __init__(self, filename="dictionary.json", journal_limit=1000, compress=False):
+        self.filename = filename
+        self.compress = compress  # Deflate payloads in .bin snapshots
+        self.journal_filename = filename + ".journal"
+        self.journal_limit = journal_limit  # Journal records allowed before compaction
+        self._journal_file = None  # Open append handle for the journal
+        self._journal_records = 0  # Records appended since the last compaction
+        self._compaction_thread = None  # Background snapshot writer, if one is running
+
+    def load(self, dictionary):
+        """Load the JSON (or binary) snapshot in one pass, then replay the journal"""
+        try:
+            if self.filename.endswith(BINARY_EXTENSION):
+                snapshot = BinarySnapshot(self.filename)
+                # Only the keys are decoded; payloads stay in the mapped file until read
+                dictionary.load_lazy(len(snapshot), snapshot.key, snapshot)
+            else:
+                self._load_json(dictionary)
+        except FileNotFoundError:
+            print("No dictionary file found. Starting fresh.")
+        except (json.JSONDecodeError, ValueError):
+            print("Error decoding dictionary file. Starting fresh.")
+        # Journal left behind by an interrupted compaction is older than the live one
+        self._replay_journal(dictionary, self.journal_filename + ".compacting")
+        self._journal_records = self._replay_journal(dictionary, self.journal_filename)
+
+    def _load_json(self, dictionary):
+        """Build the tree from a dictionary.json snapshot"""
+        with open(self.filename, "r") as file:
+            content = file.read().strip()
+            if content:
+                words = json.loads(content)
+                dictionary.bulk_load((word, data["meaning"], data.get("example", ""))
+                                     for word, data in words.items())
+
+    def _replay_journal(self, dictionary, journal_filename):
+        """Apply journal records to the tree without persisting them; returns the record count"""
+        count = 0
+        try:
+            with open(journal_filename, "r", encoding="utf-8") as journal:
+                for line in journal:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # Torn final line from a crash mid-append
+                    dictionary.apply_record(record)
+                    count += 1
+        except FileNotFoundError:
+            pass
+        return count
+
+    def write(self, dictionary, records):
+        """Append the records with a single fsync; compacts when the journal is long"""
+        try:
+            if self._journal_file is None:
+                self._journal_file = self._open_journal()
+            data = "".join(json.dumps(record) + "\n" for record in records)
+            self._journal_file.write(data)
+            self._journal_file.flush()
+            os.fsync(self._journal_file.fileno())
+            self._journal_records += len(records)
+        except Exception as e:
+            print(f"Error writing dictionary journal: {e}")
+            return 0
+        if self._journal_records >= self.journal_limit:
+            self.compact(dictionary, background=True)
+        return len(data.encode("utf-8"))
+
+    def _open_journal(self):
+        """Open the journal for appending, terminating any torn final line first"""
+        torn = False
+        if os.path.exists(self.journal_filename) and os.path.getsize(self.journal_filename) > 0:
+            with open(self.journal_filename, "rb") as existing:
+                existing.seek(-1, os.SEEK_END)
+                torn = existing.read(1) != b"\n"
+        journal = open(self.journal_filename, "a", encoding="utf-8")
+        if torn:
+            journal.write("\n")
+        return journal
+
+    def save(self, words):
+        """Write a full snapshot and drop the journal records it supersedes.
+
+        Like compact(), the caller must make sure no journal write runs
+        concurrently and that words includes every record written so far.
+        """
+        self._wait_for_compaction()
+        self._rotate_journal()
+        return self._finish_compaction(words)
+
+    def compact(self, dictionary, background=False):
+        """Fold the journal into a fresh snapshot written with an atomic rename.
+
+        The caller must make sure no journal write runs concurrently.
+        """
+        self._wait_for_compaction()
+        words = dictionary.snapshot_words()
+        self._rotate_journal()
+        if background:
+            self._compaction_thread = threading.Thread(target=self._finish_compaction,
+                                                       args=(words,))
+            self._compaction_thread.start()
+        else:
+            self._finish_compaction(words)
+
+    def _wait_for_compaction(self):
+        """Only one snapshot is written at a time"""
+        if self._compaction_thread is not None:
+            self._compaction_thread.join()
+            self._compaction_thread = None
+
+    def _rotate_journal(self):
+        """Move the live journal aside so new records start a fresh file"""
+        if self._journal_file is not None:
+            self._journal_file.close()
+            self._journal_file = None
+        self._journal_records = 0
+        compacting = self.journal_filename + ".compacting"
+        if not os.path.exists(self.journal_filename):
+            return
+        if os.path.exists(compacting):
+            # A previous compaction never finished; keep its records ahead of ours
+            with open(self.journal_filename, "r") as source, open(compacting, "a") as target:
+                target.write(source.read())
+                target.flush()
+                os.fsync(target.fileno())
+            os.remove(self.journal_filename)
+        else:
+            os.replace(self.journal_filename, compacting)
+
+    def _finish_compaction(self, words):
+        """Write the captured snapshot, then drop the journal it supersedes"""
+        written = write_snapshot(self.filename, words, compress=self.compress)
+        if written:
+            try:
+                os.remove(self.journal_filename + ".compacting")
+            except FileNotFoundError:
+                pass
+        return written
+
+    def close(self):
+        """Wait for any background compaction and close the journal"""
+        self._wait_for_compaction()
+        if self._journal_file is not None:
+            self._journal_file.close()
+            self._journal_file = None
+
+
+class SQLitePayloads:
+    """Payload source for LazyNodes loaded from SQLite; index i is the i-th loaded word"""
+    def __init__(self, backend, words):
+        self.backend = backend
+        self.words = words
+
+    def payload(self, index):
+        return self.backend.fetch(self.words[index])
+
+
+class SQLiteBackend(StorageBackend):
+    """One row per word in an indexed SQLite table, using WAL mode.
+
+    Inserts and deletes touch single rows, and only the words are read at
+    load time; meanings and examples are fetched when a node is displayed.
+    """
+    def __init__(self, filename="dictionary.db"):
+        import sqlite3  # Only needed when this backend is used
+
+        self.filename = filename
+        self._lock = threading.Lock()  # The connection is shared with the write-behind worker
+        self._connection = sqlite3.connect(filename, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            # The primary key is the index used for lookups and ordered scans
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS words ("
+                "word TEXT PRIMARY KEY, meaning TEXT NOT NULL, example TEXT NOT NULL DEFAULT ''"
+                ") WITHOUT ROWID")
+
+    def load(self, dictionary):
+        """Load every word in key order and leave payloads in the database"""
+        with self._lock:
+            words = [row[0] for row in
+                     self._connection.execute("SELECT word FROM words ORDER BY word")]
+        dictionary.load_lazy(len(words), words.__getitem__, SQLitePayloads(self, words))
+
+    def fetch(self, word):
+        """Return (meaning, example) for one word"""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT meaning, example FROM words WHERE word = ?", (word,)).fetchone()
+        return row if row else ("", "")
+
+    def write(self, dictionary, records):
+        """Apply the records to their rows in one transaction.
+
+        Returns the size of the row data written; SQLite's own page and WAL
+        overhead is not visible from here.
+        """
+        written = 0
+        try:
+            with self._lock, self._connection:
+                for record in iter_records(records):
+                    if record["op"] == "insert":
+                        row = (record["word"], record["meaning"], record["example"])
+                        self._connection.execute(
+                            "INSERT OR REPLACE INTO words (word, meaning, example) VALUES (?, ?, ?)",
+                            row)
+                        written += _row_bytes(row)
+                    else:
+                        self._connection.execute("DELETE FROM words WHERE word = ?",
+                                                 (record["word"],))
+                        written += _row_bytes((record["word"],))
+        except Exception as e:
+            print(f"Error writing dictionary database: {e}")
+            return 0
+        return written
+
+    def save(self, words):
+        """Replace the table contents in a single transaction"""
+        rows = [(word, data["meaning"], data["example"]) for word, data in words.items()]
+        try:
+            with self._lock, self._connection:
+                self._connection.execute("DELETE FROM words")
+                self._connection.executemany(
+                    "INSERT INTO words (word, meaning, example) VALUES (?, ?, ?)", rows)
+            print("Dictionary saved successfully.")
+        except Exception as e:
+            print(f"Error saving dictionary: {e}")
+            return 0
+        return sum(_row_bytes(row) for row in rows)
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+def read_shard(filename):
+    """Parse one shard file into sorted (word, meaning, example) tuples; runs in a worker process"""
+    with open(filename, "r") as file:
+        content = file.read().strip()
+    words = json.loads(content) if content else {}
+    return sorted((word, data["meaning"], data.get("example", "")) for word, data in words.items())
+
+
+class ShardedBackend(StorageBackend):
+    """A directory of range-partitioned JSON shards listed by manifest.json.
+
+    Each write rewrites only the shards its records touch, as new files, and
+    then atomically replaces the manifest to point at them. A crash
+    therefore leaves either the old or the new version of every shard a
+    batch touched. At load time the shards are parsed in parallel processes
+    and stitched in key order into one balanced tree.
+    """
+    def __init__(self, directory="dictionary.shards", boundaries=None, workers=None):
+        self.directory = directory
+        self.manifest_filename = os.path.join(directory, "manifest.json")
+        # Lower bound of each shard's key range; an existing manifest's boundaries win
+        self.boundaries = list(boundaries or DEFAULT_SHARD_BOUNDARIES)
+        self.files = [None] * len(self.boundaries)  # Current file of each shard (None when empty)
+        self.generation = 0  # Incremented by every write and used in new shard filenames
+        self.workers = workers or os.cpu_count() or 1  # Processes used to parse shards
+        try:
+            with open(self.manifest_filename, "r") as file:
+                manifest = json.load(file)
+            self.boundaries = manifest["boundaries"]
+            self.files = manifest["files"]
+            self.generation = manifest["generation"]
+        except FileNotFoundError:
+            pass
+        except (json.JSONDecodeError, KeyError, TypeError):
+            print("Error decoding shard manifest. Starting fresh.")
+
+    def shard_of(self, word):
+        """Index of the shard whose key range holds word"""
+        return bisect.bisect_right(self.boundaries, word) - 1
+
+    def _key_range(self, index):
+        """(low, high) bounds of a shard; high is exclusive, None for the last shard"""
+        high = self.boundaries[index + 1] if index + 1 < len(self.boundaries) else None
+        return self.boundaries[index], high
+
+    def load(self, dictionary):
+        """Parse the shards (in parallel when they are large) and build one tree from them"""
+        paths = [os.path.join(self.directory, name) for name in self.files if name]
+        if not paths:
+            print("No dictionary file found. Starting fresh.")
+            return
+        try:
+            size = sum(os.path.getsize(path) for path in paths)
+            if self.workers > 1 and len(paths) > 1 and size >= PARALLEL_LOAD_BYTES:
+                # Imported here so plain JSON/SQLite users never load multiprocessing
+                from concurrent.futures import ProcessPoolExecutor
+
+                with ProcessPoolExecutor(max_workers=min(self.workers, len(paths))) as pool:
+                    shards = list(pool.map(read_shard, paths))
+            else:
+                shards = [read_shard(path) for path in paths]
+        except (OSError, json.JSONDecodeError, KeyError, TypeError):
+            print("Error decoding dictionary file. Starting fresh.")
+            return
+        # Shards cover consecutive key ranges, so concatenating them keeps word order
+        dictionary.bulk_load(itertools.chain.from_iterable(shards))
+        self._remove_stale_files()
+
+    def write(self, dictionary, records):
+        """Rewrite just the shards holding the records' words, from the current tree"""
+        dirty = {self.shard_of(record["word"]) for record in iter_records(records)}
+        return self._rewrite(dirty, lambda index: dictionary.snapshot_words(*self._key_range(index)))
+
+    def save(self, words):
+        """Rewrite every shard from words ({word: {"meaning", "example"}})"""
+        shards = [{} for _ in self.boundaries]
+        for word, data in words.items():
+            shards[self.shard_of(word)][word] = data
+        written = self._rewrite(range(len(shards)), shards.__getitem__)
+        if written:
+            print("Dictionary saved successfully.")
+        return written
+
+    def _rewrite(self, indexes, shard_words):
+        """Write new files for the given shards, then commit them with one manifest rename"""
+        generation = self.generation + 1
+        files = list(self.files)
+        written = 0
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            for index in sorted(indexes):
+                words = shard_words(index)
+                if not words:
+                    files[index] = None
+                    continue
+                name = f"shard-{index:03d}-{generation}.json"
+                size = write_snapshot(os.path.join(self.directory, name), words, announce=False)
+                if not size:
+                    return 0  # write_snapshot reported the error; the manifest is untouched
+                files[index] = name
+                written += size
+            manifest = {"version": 1, "generation": generation,
+                        "boundaries": self.boundaries, "files": files}
+            size = write_snapshot(self.manifest_filename, manifest, announce=False)
+            if not size:
+                return 0
+            written += size
+        except OSError as e:
+            print(f"Error writing dictionary shards: {e}")
+            return 0
+        superseded = set(self.files) - set(files) - {None}
+        self.files = files
+        self.generation = generation
+        for name in superseded:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+        return written
+
+    def _remove_stale_files(self):
+        """Delete shard files left behind by a write that crashed before its manifest commit"""
+        current = set(self.files)
+        for name in os.listdir(self.directory):
+            if name.startswith("shard-") and name not in current:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
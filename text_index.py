@@ -0,0 +1,90 @@
+# Inverted index over meanings and example sentences for reverse lookups
+# ("which word means 'kindly'?"), ranked with BM25.
+
+import heapq
+import math
+import re
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text):
+    """Split text into lowercase alphanumeric tokens"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class InvertedIndex:
+    """Token -> postings index over documents keyed by dictionary word.
+
+    Postings map each token to {word: term frequency}. Documents can be
+    added, replaced and removed incrementally; queries are scored with BM25.
+    """
+    def __init__(self, k1=1.5, b=0.75):
+        self.k1 = k1  # Term frequency saturation
+        self.b = b  # Document length normalisation
+        self.postings = {}  # token -> {word: term frequency}
+        self.lengths = {}  # word -> document length in tokens
+        self.total_length = 0
+
+    def __len__(self):
+        return len(self.lengths)
+
+    def add(self, word, text):
+        """Index (or re-index) the document for a word"""
+        if word in self.lengths:
+            self.remove(word)
+        tokens = tokenize(text)
+        for token in tokens:
+            postings = self.postings.setdefault(token, {})
+            postings[word] = postings.get(word, 0) + 1
+        self.lengths[word] = len(tokens)
+        self.total_length += len(tokens)
+
+    def remove(self, word, text=None):
+        """Drop a word's document; text lets removal skip scanning for its tokens"""
+        if word not in self.lengths:
+            return
+        tokens = set(tokenize(text)) if text is not None else \
+            [token for token, postings in self.postings.items() if word in postings]
+        for token in tokens:
+            postings = self.postings.get(token)
+            if postings and postings.pop(word, None) is not None and not postings:
+                del self.postings[token]
+        self.total_length -= self.lengths.pop(word)
+
+    def remove_many(self, words):
+        """Drop the documents of several words in a single pass over the postings"""
+        words = {word for word in words if word in self.lengths}
+        if not words:
+            return
+        for token, postings in list(self.postings.items()):
+            # Probe whichever side is smaller
+            if len(words) < len(postings):
+                dropped = [word for word in words if word in postings]
+            else:
+                dropped = [word for word in postings if word in words]
+            for word in dropped:
+                del postings[word]
+            if dropped and not postings:
+                del self.postings[token]
+        for word in words:
+            self.total_length -= self.lengths.pop(word)
+
+    def search(self, query, limit=10):
+        """Return up to limit (score, word) pairs for the query, best first"""
+        if not self.lengths:
+            return []
+        count = len(self.lengths)
+        average_length = self.total_length / count or 1
+        scores = {}
+        for token in set(tokenize(query)):
+            postings = self.postings.get(token)
+            if not postings:
+                continue
+            # BM25 inverse document frequency, kept positive for very common tokens
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for word, frequency in postings.items():
+                norm = self.k1 * (1 - self.b + self.b * self.lengths[word] / average_length)
+                scores[word] = scores.get(word, 0.0) + \
+                    idf * frequency * (self.k1 + 1) / (frequency + norm)
+        return heapq.nlargest(limit, ((score, word) for word, score in scores.items()))